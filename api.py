@@ -1,20 +1,79 @@
-from flask import Flask, request, jsonify, send_from_directory
+from flask import Flask, request, send_from_directory
 from flask_cors import CORS
+from flask_compress import Compress
 from final_recommend_eng import SHLRecommendationEngine
+from functools import lru_cache
+import orjson
 import os
+import threading
 
 app = Flask(__name__)
 CORS(app)
+Compress(app)  # gzip/brotli based on Accept-Encoding
 
-# Initialize engine
-print("🔄 Loading recommendation engine...")
-engine = SHLRecommendationEngine()
-print("✅ API ready!")
+# Engine is built lazily, once per process (wsgi.py preloads it before fork)
+_engine = None
+_engine_lock = threading.Lock()
+
+def get_engine() -> SHLRecommendationEngine:
+    """Return the shared engine, building it on first use."""
+    global _engine
+    if _engine is None:
+        with _engine_lock:
+            if _engine is None:
+                print("🔄 Loading recommendation engine...")
+                engine = SHLRecommendationEngine()
+                # Warm up: pre-fault index pages and initialize BLAS threads
+                try:
+                    engine.get_recommendations("warmup test", top_k=1)
+                except Exception:
+                    pass
+                _engine = engine
+                print("✅ API ready!")
+    return _engine
+
+@lru_cache(maxsize=2048)
+def _cached_recommend(query_key: str, top_k: int) -> tuple:
+    """Memoized recommendations keyed on normalized query and top_k."""
+    return tuple(get_engine().get_recommendations(query_key, top_k=top_k))
+
+def _truncate_descriptions(recommendations, limit: int) -> list:
+    """Copy recommendations with descriptions cut to limit chars (0 = full)."""
+    if not limit:
+        return list(recommendations)
+    return [
+        {**rec, 'description': rec['description'][:limit] + "..."}
+        if len(rec['description']) > limit else rec
+        for rec in recommendations
+    ]
+
+def _json_response(payload, status: int = 200):
+    """Serialize payload with orjson (handles numpy scores natively)."""
+    return app.response_class(
+        orjson.dumps(payload, option=orjson.OPT_SERIALIZE_NUMPY),
+        status=status,
+        mimetype='application/json'
+    )
+
+def _ndjson_response(items, status: int = 200):
+    """Stream items as newline-delimited JSON, one orjson line per item."""
+    def generate():
+        for item in items:
+            yield orjson.dumps(
+                item, option=orjson.OPT_SERIALIZE_NUMPY | orjson.OPT_APPEND_NEWLINE
+            )
+    return app.response_class(generate(), status=status, mimetype='application/x-ndjson')
+
+def _wants_ndjson() -> bool:
+    """True if the client prefers streamed NDJSON over a single JSON body."""
+    return request.accept_mimetypes.best_match(
+        ['application/json', 'application/x-ndjson']
+    ) == 'application/x-ndjson'
 
 @app.route('/', methods=['GET'])
 def home():
     """Root endpoint - API information"""
-    return jsonify({
+    return _json_response({
         "message": "SHL Assessment Recommendation API",
         "version": "1.0.0",
         "endpoints": {
@@ -28,8 +87,9 @@ def home():
                 "method": "POST",
                 "description": "Get assessment recommendations",
                 "body": {
-                    "query": "string (required)",
-                    "top_k": "integer (optional, default: 10)"
+                    "query": "string or list of strings (required)",
+                    "top_k": "integer (optional, default: 10)",
+                    "description_truncate": "integer (optional, default: 300, 0 = full text)"
                 },
                 "example": {
                     "query": "I am hiring for Java developers",
@@ -38,73 +98,115 @@ def home():
             }
         },
         "status": "operational"
-    }), 200
+    }, 200)
 
 @app.route('/health', methods=['GET'])
 def health():
     """Health check endpoint"""
-    return jsonify({
+    return _json_response({
         "status": "healthy",
         "message": "SHL Recommendation API is running",
-        "total_assessments": len(engine.df)
-    }), 200
+        "total_assessments": get_engine().n_assessments
+    }, 200)
 
 @app.route('/recommend', methods=['POST'])
 def recommend():
     """Assessment recommendation endpoint"""
     try:
-        data = request.get_json()
+        try:
+            data = orjson.loads(request.get_data())
+        except orjson.JSONDecodeError:
+            return _json_response({
+                "error": "Invalid JSON in request body"
+            }, 400)
         
-        if not data or 'query' not in data:
-            return jsonify({
+        if not isinstance(data, dict) or 'query' not in data:
+            return _json_response({
                 "error": "Missing 'query' field in request body",
                 "example": {
                     "query": "I am hiring for Java developers",
                     "top_k": 10
                 }
-            }), 400
+            }, 400)
         
         query = data['query']
         top_k = data.get('top_k', 10)
+        description_truncate = data.get('description_truncate', 300)
         
-        if not query.strip():
-            return jsonify({
+        # A list of queries is scored in one batched pass
+        is_batch = isinstance(query, list)
+        queries = query if is_batch else [query]
+        
+        if not queries or not all(isinstance(q, str) and q.strip() for q in queries):
+            return _json_response({
                 "error": "Query cannot be empty"
-            }), 400
+            }, 400)
         
         if not isinstance(top_k, int) or top_k < 1 or top_k > 10:
-            return jsonify({
+            return _json_response({
                 "error": "top_k must be an integer between 1 and 10"
-            }), 400
+            }, 400)
+        
+        if not isinstance(description_truncate, int) or description_truncate < 0:
+            return _json_response({
+                "error": "description_truncate must be a non-negative integer"
+            }, 400)
+        
+        if is_batch:
+            batch = get_engine().get_recommendations_batch(
+                [q.strip().lower() for q in queries], top_k=top_k
+            )
+            results = [
+                {
+                    "query": q,
+                    "recommendations": _truncate_descriptions(recs, description_truncate),
+                    "count": len(recs)
+                }
+                for q, recs in zip(queries, batch)
+            ]
+            if _wants_ndjson():
+                return _ndjson_response(results)
+            return _json_response({
+                "results": results,
+                "count": len(batch)
+            }, 200)
+        
+        # Get recommendations (engine is case-insensitive, so normalize the cache key)
+        recommendations = _truncate_descriptions(
+            _cached_recommend(query.strip().lower(), top_k), description_truncate
+        )
         
-        # Get recommendations
-        recommendations = engine.get_recommendations(query, top_k=top_k)
+        # Stream one recommendation per line for NDJSON clients
+        if _wants_ndjson():
+            return _ndjson_response(recommendations)
         
-        return jsonify({
+        return _json_response({
             "query": query,
             "recommendations": recommendations,
             "count": len(recommendations)
-        }), 200
+        }, 200)
     
     except Exception as e:
-        return jsonify({
+        return _json_response({
             "error": "Internal server error",
             "message": str(e)
-        }), 500
+        }, 500)
 
 @app.route('/test', methods=['GET'])
 def test():
     """Test endpoint with sample query"""
     sample_query = "I am hiring for Java developers who can also collaborate effectively with my business teams."
-    recommendations = engine.get_recommendations(sample_query, top_k=5)
+    recommendations = _cached_recommend(sample_query.strip().lower(), 5)
     
-    return jsonify({
+    return _json_response({
         "test_query": sample_query,
         "recommendations": recommendations,
         "count": len(recommendations),
         "message": "This is a test endpoint. Use POST /recommend for real queries."
-    }), 200
+    }, 200)
 
 if __name__ == '__main__':
+    # Local development only - use wsgi.py with gunicorn in production
+    get_engine()
     port = int(os.environ.get('PORT', 5000))
     app.run(host='0.0.0.0', port=port, debug=False)
\ No newline at end of file
@@ -17,6 +17,12 @@ def load_engine():
 
 engine = load_engine()
 
+# Assessment count (cached - file is read-only)
+@st.cache_data
+def load_stats():
+    with open('preprocessed_assessments.json', 'r') as f:
+        return len(json.load(f))
+
 # Session state for query
 if 'current_query' not in st.session_state:
     st.session_state.current_query = ""
@@ -36,12 +42,7 @@ with st.sidebar:
     """)
     
     st.header("📊 Statistics")
-    try:
-        with open('preprocessed_assessments.json', 'r') as f:
-            assessments = json.load(f)
-        st.metric("Total Assessments", len(assessments))
-    except:
-        st.metric("Total Assessments", "N/A")
+    st.metric("Total Assessments", load_stats())
 
 # Main input
 query = st.text_area(
@@ -72,29 +73,46 @@ if st.button("🔍 Get Recommendations", type="primary"):
             display_df = pd.DataFrame({
                 '№': range(1, len(df) + 1),
                 'Assessment Name': df['name'],
-                'Test Types': df['test_type'].apply(lambda x: ', '.join(x)),
-                'URL': df['url'].apply(lambda x: f'[View Assessment]({x})')
+                'Test Types': df['test_type'].str.join(', '),
+                'URL': df['url']
             })
             
             st.markdown("### 📋 Recommended Assessments")
-            st.markdown(display_df.to_markdown(index=False))
+            st.dataframe(
+                display_df,
+                hide_index=True,
+                use_container_width=True,
+                column_config={
+                    'URL': st.column_config.LinkColumn("URL", display_text="View Assessment")
+                }
+            )
             
-            # Detailed view in expanders
+            # Detailed view as a single read-only grid
             st.markdown("### 📖 Detailed Information")
-            for i, rec in enumerate(recommendations, 1):
-                with st.expander(f"{i}. {rec['name']}"):
-                    col1, col2 = st.columns(2)
-                    with col1:
-                        st.write("**Test Types:**", ', '.join(rec['test_type']))
-                        st.write("**Adaptive Support:**", "✅" if rec['adaptive_support'] else "❌")
-                    with col2:
-                        st.write("**Remote Support:**", "✅" if rec['remote_support'] else "❌")
-                        if rec.get('duration'):
-                            st.write("**Duration:**", f"{rec['duration']} minutes")
-                    
-                    st.write("**Description:**")
-                    st.write(rec['description'][:300] + "..." if len(rec['description']) > 300 else rec['description'])
-                    st.markdown(f"**🔗 [Open Assessment Page]({rec['url']})**")
+            details_df = pd.DataFrame({
+                'Assessment Name': df['name'],
+                'Test Types': display_df['Test Types'],
+                'Adaptive Support': df['adaptive_support'],
+                'Remote Support': df['remote_support'],
+                'Duration (min)': df['duration'],
+                'Description': df['description'].mask(
+                    df['description'].str.len() > 300,
+                    df['description'].str[:300] + "..."
+                ),
+                'URL': df['url']
+            })
+            st.data_editor(
+                details_df,
+                disabled=True,
+                hide_index=True,
+                use_container_width=True,
+                column_config={
+                    'Adaptive Support': st.column_config.CheckboxColumn("Adaptive Support"),
+                    'Remote Support': st.column_config.CheckboxColumn("Remote Support"),
+                    'Description': st.column_config.TextColumn("Description", width="large"),
+                    'URL': st.column_config.LinkColumn("URL", display_text="Open Assessment Page")
+                }
+            )
         else:
             st.warning("No recommendations found. Try a different query.")
 
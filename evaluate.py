@@ -3,16 +3,52 @@
 Final Evaluation Script - Assignment Compliant
 Computes Mean Recall@10 as specified in assignment
 """
+import numpy as np
 import pandas as pd
+import pyarrow as pa
+import scipy.sparse as sp
+import pyarrow.csv as pacsv
 from final_recommend_eng import SHLRecommendationEngine
 import json
 
 
 def normalize_url(url: str) -> str:
-    """Normalize URL for comparison."""
+    """Normalize a single URL for comparison (see main() for the bulk path)."""
     return url.strip().lower()
 
 
+def recall_matrices(pred_urls: list, ground_truths: list, k: int = 10):
+    """
+    Compute Recall@k for all queries at once.
+    
+    Predictions and ground truth are one-hot encoded as CSR matrices over the
+    union of URLs, so matches are a single elementwise product.
+    Returns (matched matrix, URL vocabulary, matched counts, recall array).
+    """
+    vocab = sorted(set().union(*ground_truths, *(p[:k] for p in pred_urls)))
+    url_idx = {url: i for i, url in enumerate(vocab)}
+    
+    def one_hot(rows):
+        row_ids = [r for r, urls in enumerate(rows) for _ in urls]
+        col_ids = [url_idx[u] for urls in rows for u in urls]
+        m = sp.csr_matrix(
+            (np.ones(len(col_ids), dtype=np.int8), (row_ids, col_ids)),
+            shape=(len(rows), len(vocab))
+        )
+        m.data[:] = 1  # collapse duplicate predictions
+        return m
+    
+    pred = one_hot([p[:k] for p in pred_urls])
+    gt = one_hot([list(g) for g in ground_truths])
+    
+    matched = pred.multiply(gt).tocsr()
+    matched_counts = np.asarray(matched.sum(axis=1)).ravel()
+    gt_counts = np.asarray(gt.sum(axis=1)).ravel()
+    recall = np.divide(matched_counts, gt_counts,
+                       out=np.zeros(len(gt_counts)), where=gt_counts > 0)
+    return matched, vocab, matched_counts, recall
+
+
 def main():
     print("="*80)
     print("FINAL EVALUATION - MEAN RECALL@10")
@@ -21,7 +57,8 @@ def main():
     # Load training data
     print("\n📂 Loading Train_file.csv...")
     train = pd.read_csv("Train_file.csv")
-    train['Assessment_url'] = train['Assessment_url'].apply(normalize_url)
+    train['Assessment_url'] = train['Assessment_url'].str.strip().str.lower()
+    gt_by_query = train.groupby('Query')['Assessment_url'].agg(set).to_dict()
     
     print(f"✅ Loaded {len(train)} training examples")
     print(f"   From {train['Query'].nunique()} unique queries")
@@ -38,24 +75,29 @@ def main():
     all_predictions = []
     query_metrics = []
     
-    for query_num, query in enumerate(train['Query'].unique(), 1):
+    # Score all queries in one vectorized pass
+    queries = list(train['Query'].unique())
+    all_recommendations = engine.get_recommendations_batch(queries, top_k=10)
+    
+    pred_urls_all = [[normalize_url(rec['url']) for rec in recs] for recs in all_recommendations]
+    ground_truths = [gt_by_query[query] for query in queries]
+    
+    # Calculate Recall@10 for every query in one vectorized pass
+    matched_matrix, url_vocab, matched_counts, recalls = recall_matrices(
+        pred_urls_all, ground_truths, k=10
+    )
+    
+    for query_num, (query, pred_urls, ground_truth) in enumerate(
+            zip(queries, pred_urls_all, ground_truths), 1):
         print(f"\n📝 Query {query_num}: {query[:70]}...")
-        
-        # Get ground truth
-        ground_truth = set(train[train['Query'] == query]['Assessment_url'])
         print(f"   Ground truth: {len(ground_truth)} assessments")
-        
-        # Get recommendations
-        recommendations = engine.get_recommendations(query, top_k=10)
-        pred_urls = [normalize_url(rec['url']) for rec in recommendations]
-        
         print(f"   Predicted: {len(pred_urls)} assessments")
         
-        # Calculate Recall@10
-        matched = set(pred_urls[:10]) & ground_truth
-        recall_at_10 = len(matched) / len(ground_truth) if ground_truth else 0.0
+        row = query_num - 1
+        matched = [url_vocab[i] for i in matched_matrix[row].indices]
+        recall_at_10 = float(recalls[row])
         
-        print(f"   ✅ Matched: {len(matched)}/{len(ground_truth)}")
+        print(f"   ✅ Matched: {int(matched_counts[row])}/{len(ground_truth)}")
         print(f"   📊 Recall@10: {recall_at_10:.2%}")
         
         # Store predictions in required format
@@ -70,14 +112,14 @@ def main():
             'query_num': query_num,
             'query': query[:100],
             'ground_truth_count': len(ground_truth),
-            'matched_count': len(matched),
+            'matched_count': int(matched_counts[row]),
             'recall_at_10': recall_at_10
         })
         
         # Show what matched
         if matched:
             print(f"   ✓ Matched URLs:")
-            for url in list(matched)[:3]:
+            for url in matched[:3]:
                 print(f"     - .../{url.split('/')[-2] if '/' in url else url}")
     
     # Calculate Mean Recall@10
@@ -85,7 +127,7 @@ def main():
     print("FINAL RESULTS")
     print("="*80)
     
-    mean_recall_10 = sum(m['recall_at_10'] for m in query_metrics) / len(query_metrics)
+    mean_recall_10 = float(recalls.mean())
     
     print(f"\n🎯 MEAN RECALL@10: {mean_recall_10:.4f} ({mean_recall_10*100:.2f}%)")
     print(f"\n📊 Per-Query Breakdown:")
@@ -97,7 +139,7 @@ def main():
     
     # Save predictions in assignment format
     pred_df = pd.DataFrame(all_predictions)
-    pred_df.to_csv('predictions.csv', index=False)
+    pacsv.write_csv(pa.Table.from_pandas(pred_df, preserve_index=False), 'predictions.csv')
     print(f"\n💾 Predictions saved to: predictions.csv")
     print(f"   Format: Query | Assessment_url (Assignment compliant)")
     
@@ -2,25 +2,241 @@
 """
 FIXED Recommendation Engine - URL normalization & better matching
 """
+import hashlib
 import json
 import re
 from typing import List, Dict, Any, Set, Tuple
+import joblib
 import numpy as np
 import pandas as pd
+import scipy.sparse as sp
+import sklearn
 from sklearn.feature_extraction.text import TfidfVectorizer
-from sklearn.metrics.pairwise import cosine_similarity
+from bisect import bisect_right
 from collections import defaultdict
+from functools import lru_cache
 import os
+import shutil
+
+try:
+    import hnswlib
+except ImportError:  # ANN index is optional; fall back to an exact scan
+    hnswlib = None
+
+try:
+    from numba import njit
+except ImportError:  # numba is optional; run the same code as plain NumPy
+    def njit(*args, **kwargs):
+        return lambda func: func
+
+# Query features are found by str.find scans with explicit word-boundary
+# checks (see _scan_query_features); technologies come back as bits indexed
+# by _TECHNOLOGIES, categories as _CAT_* bits.
+_TECHNOLOGIES = ['java', 'javascript', 'python', 'sql', 'selenium', 'excel', 'html', 'css']
+_CAT_P, _CAT_K, _CAT_C = 1, 2, 4
+
+# Category keywords are plain substring matches
+_COLLAB_KEYWORDS = (
+    'collaborate', 'collaboration', 'collaborative',
+    'communicate', 'communication', 'interpersonal',
+    'team', 'teamwork', 'stakeholder', 'business teams',
+    'work with', 'interact with', 'personality', 'behavioral',
+    'soft skills', 'people skills'
+)
+_TECHNICAL_KEYWORDS = ('technical', 'coding', 'programming', 'developer', 'engineer')
+_COGNITIVE_KEYWORDS = ('cognitive', 'analytical', 'reasoning', 'analyst')
+
+# Catalog name patterns used to enrich the TF-IDF text
+_CATALOG_TECH_RE = re.compile(
+    r'\b(java|python|sql|javascript|selenium|html|css|c\+\+|excel|tableau|aws|azure|react|angular|node)\b'
+)
+# Keywords added per test code, as (block, repeats)
+_TYPE_KEYWORDS = {
+    'K': ('technical knowledge skills programming coding development', 5),
+    'P': ('personality behavioral collaboration communication interpersonal teamwork', 5),
+    'C': ('cognitive reasoning analytical problem solving numerical verbal', 5),
+    'A': ('ability aptitude skills', 3),
+    'D': ('development 360 feedback', 3),
+    'S': ('simulation practical', 3)
+}
+_LEADERSHIP_RE = re.compile('leadership|executive|coo|manager|opq')
+_BANKING_RE = re.compile('bank|financial|admin|clerk')
+# CSR arrays stored as .npy files in the index cache (see _memmap_matrix)
+_MATRIX_PARTS = ('data', 'indices', 'indptr')
+
+# Canonical catalog URL prefix; normalized URLs are this plus the slug
+_CATALOG_VIEW_URL = "https://www.shl.com/solutions/products/product-catalog/view/"
+
+
+def _is_word_char(ch: str) -> bool:
+    return ch.isalnum() or ch == '_'
+
+
+def _has_word(text: str, word: str) -> bool:
+    """True if word occurs in text with a word boundary on both sides."""
+    i = text.find(word)
+    while i != -1:
+        end = i + len(word)
+        if ((i == 0 or not _is_word_char(text[i - 1])) and
+                (end == len(text) or not _is_word_char(text[end]))):
+            return True
+        i = text.find(word, i + 1)
+    return False
+
+
+def _scan_query_features(text: str) -> Tuple[int, int, int]:
+    """Scan lowercased query text once per keyword.
+    
+    Returns (technology bits, category bits, max duration or -1).
+    """
+    tech_bits = 0
+    
+    # 'java' not followed by 'script' is Java; 'java script', 'javascript'
+    # and anything ending in 'js' count as JavaScript
+    i = text.find('java')
+    while i != -1:
+        end = i + 4
+        after = end
+        while after < len(text) and text[after].isspace():
+            after += 1
+        if text.startswith('script', after):
+            tech_bits |= 2
+        elif ((i == 0 or not _is_word_char(text[i - 1])) and
+                (end == len(text) or not _is_word_char(text[end]))):
+            tech_bits |= 1
+        i = text.find('java', end)
+    if not tech_bits & 2:
+        i = text.find('js')
+        while i != -1:
+            if i + 2 == len(text) or not _is_word_char(text[i + 2]):
+                tech_bits |= 2
+                break
+            i = text.find('js', i + 1)
+    for bit in range(2, len(_TECHNOLOGIES)):
+        if _has_word(text, _TECHNOLOGIES[bit]):
+            tech_bits |= 1 << bit
+    
+    cat_bits = 0
+    if any(kw in text for kw in _COLLAB_KEYWORDS):
+        cat_bits |= _CAT_P
+    if any(kw in text for kw in _TECHNICAL_KEYWORDS):
+        cat_bits |= _CAT_K
+    if any(kw in text for kw in _COGNITIVE_KEYWORDS):
+        cat_bits |= _CAT_C
+    
+    # First '<digits> min' / '<digits>min' (also matches 'minute')
+    duration_max = -1
+    i = text.find('min')
+    while i != -1:
+        digits_end = i
+        while digits_end > 0 and text[digits_end - 1].isspace():
+            digits_end -= 1
+        digits_start = digits_end
+        while digits_start > 0 and text[digits_start - 1].isdecimal():
+            digits_start -= 1
+        if digits_start < digits_end:
+            duration_max = int(text[digits_start:digits_end])
+            break
+        i = text.find('min', i + 1)
+    
+    return tech_bits, cat_bits, duration_max
+
+
+class _EnrichedTextAnalyzer:
+    """Word n-gram analyzer that expands repeated text blocks without rescanning them.
+    
+    A document is a list of (text, repeats) blocks and yields the n-grams of
+    the text with each block written out `repeats` times. Each block is
+    tokenized once and its n-grams multiplied; only the n-grams that span a
+    boundary between copies or blocks are built from the joined tokens.
+    Plain strings (queries) get ordinary lowercase word n-grams.
+    """
+    
+    def __init__(self, ngram_range: Tuple[int, int], token_pattern: str):
+        self.ngram_range = ngram_range
+        self.token_re = re.compile(token_pattern)
+    
+    def _ngrams(self, tokens: List[str]) -> List[str]:
+        min_n, max_n = self.ngram_range
+        return [' '.join(tokens[i:i + n])
+                for n in range(min_n, max_n + 1)
+                for i in range(len(tokens) - n + 1)]
+    
+    def __call__(self, doc) -> List[str]:
+        if isinstance(doc, str):
+            return self._ngrams(self.token_re.findall(doc.lower()))
+        
+        min_n, max_n = self.ngram_range
+        grams, tokens, starts = [], [], []
+        for text, repeats in doc:
+            block = self.token_re.findall(text.lower())
+            if not block or repeats < 1:
+                continue
+            grams += self._ngrams(block) * repeats
+            starts += range(len(tokens), len(tokens) + len(block) * repeats, len(block))
+            tokens += block * repeats
+        
+        # n-grams starting before a boundary and ending after it
+        boundaries = starts[1:]
+        for i in sorted({i for b in boundaries for i in range(max(b - max_n + 1, 0), b)}):
+            nearest = boundaries[bisect_right(boundaries, i)]
+            for n in range(max(min_n, nearest - i + 1), min(max_n, len(tokens) - i) + 1):
+                grams.append(' '.join(tokens[i:i + n]))
+        return grams
+
+
+@njit(cache=True, fastmath=True)
+def _score_topk(boosted, k):
+    """Positions of the k highest boosted scores, best first (ties by position)."""
+    n = boosted.shape[0]
+    if k < n:
+        # k-th largest via partition; ties at the cut keep the lowest positions
+        kth = -np.partition(-boosted, k - 1)[k - 1]
+        above = np.flatnonzero(boosted > kth)
+        ties = np.flatnonzero(boosted == kth)[:k - above.shape[0]]
+        top = np.sort(np.concatenate((above, ties)))
+    else:
+        top = np.arange(n)
+    order = np.argsort(-boosted[top], kind='mergesort')
+    return top[order]
 
 
 class SHLRecommendationEngine:
+    # Number of candidates pulled from the index before boosting/balancing
+    CANDIDATE_POOL = 100
+    # Below this many rows the exact sparse scan beats HNSW on speed and
+    # memory (the index holds a dense float32 copy of every row)
+    ANN_MIN_DOCS = 20_000
+    # Distinct queries whose features/vectors are memoized per engine
+    QUERY_CACHE_SIZE = 1024
+    # Times each enrichment block is repeated (see _enriched_documents)
+    NAME_WEIGHT = 10
+    TECH_WEIGHT = 20
+    TEST_TYPE_WEIGHT = 15
+    DESCRIPTION_WEIGHT = 3
+    # Bump when the enrichment, vectorizer or HNSW settings change to
+    # invalidate indexes cached on disk
+    INDEX_CACHE_VERSION = 3
+
     def __init__(self, data_file: str = 'preprocessed_assessments.json',
-                 train_file: str = 'Train_file.csv'):
-        """Initialize with FIXED URL matching."""
+                 train_file: str = 'Train_file.csv',
+                 cache_dir: str = 'engine_cache', keep_df: bool = False):
+        """Initialize with FIXED URL matching.
+        
+        The catalog DataFrame is dropped once the column arrays and indexes
+        are built; pass keep_df=True to keep it as self.df for debugging.
+        """
         print("🚀 Initializing SHL Recommendation Engine (FIXED)...")
         
+        self.cache_dir = cache_dir
+        self._keep_df = keep_df
+        
         self.df = self._load_data(data_file)
-        print(f"✅ Loaded {len(self.df)} individual test solutions")
+        self.n_assessments = len(self.df)
+        print(f"✅ Loaded {self.n_assessments} individual test solutions")
+        
+        # Columnar copies of the catalog for fast per-index access
+        self._build_column_arrays()
         
         # Build URL mappings with normalization
         self._build_url_index()
@@ -28,38 +244,86 @@ class SHLRecommendationEngine:
         # Load training data with robust URL matching
         self.train_queries = defaultdict(set)
         self.assessment_training_patterns = defaultdict(set)
+        self._train_query_terms = {}
+        self._train_query_url_indices = {}
         
         if train_file and os.path.exists(train_file):
             self._load_training_data(train_file)
         
-        # Build TF-IDF index
-        print("🔍 Building TF-IDF search index...")
-        self.tfidf_matrix, self.vectorizer = self._build_tfidf_index()
+        # Build TF-IDF index (reused from disk when the catalog is unchanged);
+        # the document matrix is memory-mapped so worker processes share it
+        self.tfidf_matrix, self.vectorizer = self._load_or_build_tfidf_index(data_file)
+        # Scoring is a bare dot product, which equals cosine only for unit rows
+        assert self.vectorizer.norm == 'l2', "TF-IDF rows must be L2-normalized"
         
-        print("✅ Engine ready!")
-    
-    def _normalize_url(self, url: str) -> str:
-        """Normalize URL for robust matching."""
-        url = url.strip().lower()
+        # Assessments referenced by training data must always be rescored;
+        # taken from the same rows the boosts land on (incl. URL duplicates)
+        self.trained_indices = np.unique(np.concatenate(
+            [np.empty(0, dtype=np.int64), *self._train_query_url_indices.values()]
+        ))
         
-        # Extract slug (last meaningful part)
-        parts = url.rstrip('/').split('/')
-        slug = parts[-1] if parts else ''
+        # Build ANN index for sublinear candidate search
+        self.ann_index = self._build_ann_index()
         
-        # Build normalized format
-        return f"https://www.shl.com/solutions/products/product-catalog/view/{slug}/"
+        # Memoize per-query work; cached values are shared, treat as read-only
+        self._cached_features = lru_cache(maxsize=self.QUERY_CACHE_SIZE)(self._extract_query_features)
+        self._cached_query_vec = lru_cache(maxsize=self.QUERY_CACHE_SIZE)(self._vectorize_query)
+        
+        # Queries only touch the NumPy arrays from here on
+        if not self._keep_df:
+            del self.df
+        
+        print("✅ Engine ready!")
+    
+    def _build_column_arrays(self):
+        """Cache catalog columns as NumPy arrays (struct-of-arrays)."""
+        self._names = self.df['name'].to_numpy()
+        self._urls = self.df['url'].to_numpy()
+        self._descriptions = self.df['description'].fillna('').to_numpy()
+        self._durations = self.df['duration'].to_numpy(dtype=float)  # NaN if unknown
+        self._adaptive = self.df['adaptive_support'].fillna(False).to_numpy(dtype=bool)
+        self._remote = self.df['remote_support'].fillna(False).to_numpy(dtype=bool)
+        self._test_types = self.df['test_type'].tolist()
+        
+        # Primary category per assessment and integer URL ids, for balancing
+        self._primary_cat = np.array([
+            'K' if 'K' in t else 'P' if 'P' in t else 'C' if 'C' in t else 'A' if 'A' in t else 'O'
+            for t in self._test_types
+        ])
+        self._url_ids = pd.factorize(self.df['url'])[0]
+    
+    def _result(self, idx: int, score: float) -> Dict[str, Any]:
+        """Build the recommendation dict for catalog row idx."""
+        duration = self._durations[idx]
+        return {
+            'name': self._names[idx],
+            'url': self._urls[idx],
+            'description': self._descriptions[idx],
+            'duration': None if np.isnan(duration) else int(duration),
+            'adaptive_support': bool(self._adaptive[idx]),
+            'remote_support': bool(self._remote[idx]),
+            'test_type': self._test_types[idx],
+            'score': float(score)
+        }
+    
+    @staticmethod
+    def _normalize_url_series(urls: pd.Series) -> pd.Series:
+        """Normalize URLs for robust matching: lowercase slug under _CATALOG_VIEW_URL."""
+        urls = urls.str.strip().str.lower().str.rstrip('/')
+        slug = urls.str.rsplit('/', n=1).str[-1]
+        return _CATALOG_VIEW_URL + slug + "/"
     
     def _build_url_index(self):
         """Build normalized URL index for matching."""
-        self.url_to_idx = {}
-        self.normalized_to_actual = {}
+        actual_urls = self.df['url'].str.lower()
+        self._norm_urls = self._normalize_url_series(self.df['url']).to_numpy()
         
-        for idx, row in self.df.iterrows():
-            actual_url = row['url'].lower()
-            normalized_url = self._normalize_url(actual_url)
-            
-            self.url_to_idx[actual_url] = idx
-            self.normalized_to_actual[normalized_url] = actual_url
+        self.url_to_idx = dict(zip(actual_urls, self.df.index))
+        self.normalized_to_actual = dict(zip(self._norm_urls, actual_urls))
+        
+        self._url_norm_to_idx = defaultdict(list)
+        for idx, normalized_url in enumerate(self._norm_urls):
+            self._url_norm_to_idx[normalized_url].append(idx)
     
     def _load_data(self, file_path: str) -> pd.DataFrame:
         """Load preprocessed assessments."""
@@ -77,22 +341,33 @@ class SHLRecommendationEngine:
         print(f"📚 Loading training data from {train_file}...")
         train_df = pd.read_csv(train_file)
         
-        matched_count = 0
-        total_count = len(train_df)
+        train_df['q'] = train_df['Query'].str.lower().str.strip()
+        train_df['norm'] = self._normalize_url_series(train_df['Assessment_url'])
+        
+        # Find matching actual URLs in our data with one join
+        catalog = pd.DataFrame({
+            'norm': list(self.normalized_to_actual.keys()),
+            'actual': list(self.normalized_to_actual.values())
+        })
+        merged = train_df.merge(catalog, on='norm', how='inner')
+        
+        for query, urls in merged.groupby('q')['actual'].agg(set).items():
+            self.train_queries[query].update(urls)
+        for url, queries in merged.groupby('actual')['q'].agg(set).items():
+            self.assessment_training_patterns[url].update(queries)
+        
+        # Per training query: its term set and the catalog rows it points to
+        self._train_query_terms = {q: frozenset(q.split()) for q in self.train_queries}
+        self._train_query_url_indices = {
+            q: np.unique(np.array(
+                [i for u in urls for i in self._url_norm_to_idx[self._norm_urls[self.url_to_idx[u]]]],
+                dtype=np.int64
+            ))
+            for q, urls in self.train_queries.items()
+        }
         
-        for _, row in train_df.iterrows():
-            query = row['Query'].lower().strip()
-            train_url = row['Assessment_url'].strip()
-            
-            # Normalize training URL
-            normalized = self._normalize_url(train_url)
-            
-            # Find matching actual URL in our data
-            if normalized in self.normalized_to_actual:
-                actual_url = self.normalized_to_actual[normalized]
-                self.train_queries[query].add(actual_url)
-                self.assessment_training_patterns[actual_url].add(query)
-                matched_count += 1
+        matched_count = len(merged)
+        total_count = len(train_df)
         
         print(f"✅ Processed {total_count} training examples")
         print(f"   Matched {matched_count}/{total_count} URLs in catalog ({matched_count/total_count*100:.1f}%)")
@@ -102,78 +377,215 @@ class SHLRecommendationEngine:
             print(f"   ⚠️  Warning: Only {matched_count/total_count*100:.0f}% of training URLs matched!")
             print(f"   This suggests URL format issues in scraper or preprocessing.")
     
-    def _build_tfidf_index(self) -> Tuple[np.ndarray, TfidfVectorizer]:
-        """Build TF-IDF index with enhanced features."""
-        enriched_texts = []
+    def _enriched_documents(self) -> List[List[Tuple[str, int]]]:
+        """Enriched text per assessment as (block, repeats) lists.
+        
+        Each block is stored once with the number of times it is repeated
+        in the enriched text; _EnrichedTextAnalyzer expands the repeats at
+        the n-gram level instead of in the string.
+        """
+        df = self.df
+        name = df['name'].fillna('')
+        name_lower = name.str.lower()
+        no_text = pd.Series('', index=df.index)
+        
+        # Name and the technologies it mentions
+        tech_terms = name_lower.str.findall(_CATALOG_TECH_RE).str.join(' ')
+        
+        # Leadership/Executive boost
+        leadership = no_text.mask(
+            name_lower.str.contains(_LEADERSHIP_RE), 'leadership executive senior management strategy'
+        )
         
-        for _, row in self.df.iterrows():
-            parts = []
-            
-            # Name (10x weight)
-            name = row['name']
-            parts.extend([name] * 10)
-            
-            # Extract technologies from name
-            name_lower = name.lower()
-            tech_terms = re.findall(
-                r'\b(java|python|sql|javascript|selenium|html|css|c\+\+|excel|tableau|aws|azure|react|angular|node)\b',
-                name_lower
-            )
-            parts.extend(tech_terms * 20)  # Very high weight
-            
-            # Leadership/Executive boost
-            if any(kw in name_lower for kw in ['leadership', 'executive', 'coo', 'manager', 'opq']):
-                parts.extend(['leadership', 'executive', 'senior', 'management', 'strategy'] * 10)
-            
-            # Banking/Financial boost
-            if any(kw in name_lower for kw in ['bank', 'financial', 'admin', 'clerk']):
-                parts.extend(['banking', 'financial', 'administrative', 'clerical'] * 8)
-            
-            # Test types (15x weight - CRITICAL for matching)
-            test_types = row.get('test_type', [])
-            parts.extend(test_types * 15)
-            
-            # Map test codes to keywords
-            type_keywords = {
-                'K': ['technical', 'knowledge', 'skills', 'programming', 'coding', 'development'] * 5,
-                'P': ['personality', 'behavioral', 'collaboration', 'communication', 'interpersonal', 'teamwork'] * 5,
-                'C': ['cognitive', 'reasoning', 'analytical', 'problem solving', 'numerical', 'verbal'] * 5,
-                'A': ['ability', 'aptitude', 'skills'] * 3,
-                'D': ['development', '360', 'feedback'] * 3,
-                'S': ['simulation', 'practical'] * 3
-            }
-            
-            for tt in test_types:
-                if tt in type_keywords:
-                    parts.extend(type_keywords[tt])
-            
-            # Description (3x)
-            desc = row.get('description', '')
-            parts.extend([desc] * 3)
-            
-            # Duration
-            if pd.notna(row.get('duration')):
-                duration = row['duration']
-                parts.append(f"duration {duration} minutes")
-                if duration <= 30:
-                    parts.extend(['quick', 'short'] * 2)
-                elif duration <= 45:
-                    parts.extend(['standard', 'medium'] * 2)
-            
-            enriched_texts.append(' '.join(str(p) for p in parts if p))
+        # Banking/Financial boost
+        banking = no_text.mask(
+            name_lower.str.contains(_BANKING_RE), 'banking financial administrative clerical'
+        )
+        
+        # Test types (CRITICAL for matching), then their mapped keywords
+        test_types = df['test_type']
+        type_keywords = test_types.map(
+            lambda codes: [_TYPE_KEYWORDS[c] for c in codes if c in _TYPE_KEYWORDS]
+        )
         
+        # Duration
+        duration = df['duration']
+        duration_text = no_text.mask(
+            duration.notna(), 'duration ' + duration.astype(str) + ' minutes'
+        )
+        duration_band = no_text.mask(duration <= 45, 'standard medium').mask(duration <= 30, 'quick short')
+        
+        head = zip(name, tech_terms, leadership, banking, test_types.str.join(' '))
+        head_repeats = (self.NAME_WEIGHT, self.TECH_WEIGHT, 10, 8, self.TEST_TYPE_WEIGHT)
+        tail = zip(df['description'].fillna(''), duration_text, duration_band)
+        tail_repeats = (self.DESCRIPTION_WEIGHT, 1, 2)
+        return [
+            list(zip(h, head_repeats)) + keywords + list(zip(t, tail_repeats))
+            for h, keywords, t in zip(head, type_keywords, tail)
+        ]
+    
+    def _build_tfidf_index(self) -> Tuple[sp.csr_matrix, TfidfVectorizer]:
+        """Build TF-IDF index with enhanced features."""
         vectorizer = TfidfVectorizer(
+            analyzer=_EnrichedTextAnalyzer(
+                ngram_range=(1, 3),
+                token_pattern=r'\b[a-zA-Z][a-zA-Z+#\.]*\b'
+            ),
             max_features=15000,
-            ngram_range=(1, 3),
             min_df=1,
             max_df=0.85,
             sublinear_tf=True,
-            token_pattern=r'\b[a-zA-Z][a-zA-Z+#\.]*\b'
+            norm='l2',
+            dtype=np.float32
         )
         
-        tfidf_matrix = vectorizer.fit_transform(enriched_texts)
+        # Keep the document matrix CSR: scoring multiplies it by a dense query
+        # vector on the right, which is a row-major sweep in CSR (CSC would
+        # scatter writes per column), and _memmap_matrix persists CSR arrays.
+        tfidf_matrix = vectorizer.fit_transform(self._enriched_documents()).tocsr()
         return tfidf_matrix, vectorizer
     
+    def _load_or_build_tfidf_index(self, data_file: str) -> Tuple[sp.csr_matrix, TfidfVectorizer]:
+        """Load the fitted TF-IDF index from cache_dir, or build and cache it.
+        
+        The cache key covers the catalog file's mtime and size, the index
+        settings and the scikit-learn version, so any change forces a rebuild.
+        The joblib file holds the vectorizer; the document matrix is stored
+        as .npy parts in doc_matrix_<key>/ and memory-mapped on load. The ANN
+        index is cached under the same key.
+        """
+        stat = os.stat(data_file)
+        key = hashlib.sha1(repr((
+            self.INDEX_CACHE_VERSION, sklearn.__version__,
+            os.path.abspath(data_file), stat.st_mtime_ns, stat.st_size,
+            self.NAME_WEIGHT, self.TECH_WEIGHT, self.TEST_TYPE_WEIGHT, self.DESCRIPTION_WEIGHT
+        )).encode()).hexdigest()[:16]
+        self._index_key = key  # shared with the cached ANN index
+        cache_path = os.path.join(self.cache_dir, f"tfidf_index_{key}.joblib")
+        matrix_dir = os.path.join(self.cache_dir, f"doc_matrix_{key}")
+        
+        if os.path.exists(cache_path):
+            try:
+                cached = joblib.load(cache_path)
+                tfidf_matrix = self._memmap_matrix(matrix_dir, cached['shape'])
+                print("🔍 Loaded cached TF-IDF search index")
+                return tfidf_matrix, cached['vectorizer']
+            except Exception as e:
+                print(f"   ⚠️  Could not load cached index ({e}), rebuilding")
+                shutil.rmtree(matrix_dir, ignore_errors=True)
+        
+        print("🔍 Building TF-IDF search index...")
+        tfidf_matrix, vectorizer = self._build_tfidf_index()
+        
+        try:
+            os.makedirs(self.cache_dir, exist_ok=True)
+            # Matrix parts first: the joblib file marks a complete cache entry
+            self._save_matrix(tfidf_matrix, matrix_dir)
+            # Write-then-rename so concurrent workers never load a partial file
+            tmp_path = f"{cache_path}.{os.getpid()}.tmp"
+            joblib.dump({'shape': tfidf_matrix.shape, 'vectorizer': vectorizer}, tmp_path, compress=3)
+            os.replace(tmp_path, cache_path)
+            self._remove_stale_matrices(matrix_dir)
+            tfidf_matrix = self._memmap_matrix(matrix_dir, tfidf_matrix.shape)
+        except OSError as e:
+            print(f"   ⚠️  Could not cache TF-IDF index ({e}), keeping it in RAM")
+        
+        return tfidf_matrix, vectorizer
+    
+    def _save_matrix(self, matrix: sp.csr_matrix, matrix_dir: str) -> None:
+        """Write the CSR arrays of matrix as .npy files in matrix_dir."""
+        if os.path.isdir(matrix_dir):
+            return  # another worker built the same index
+        # Fill a private directory, then rename it into place in one step
+        tmp_dir = f"{matrix_dir}.{os.getpid()}.tmp"
+        os.makedirs(tmp_dir, exist_ok=True)
+        for part in _MATRIX_PARTS:
+            np.save(os.path.join(tmp_dir, f"{part}.npy"), getattr(matrix, part))
+        try:
+            os.rename(tmp_dir, matrix_dir)
+        except OSError:
+            if not os.path.isdir(matrix_dir):
+                raise
+            shutil.rmtree(tmp_dir, ignore_errors=True)  # lost the race; same content
+    
+    def _memmap_matrix(self, matrix_dir: str, shape: Tuple[int, int]) -> sp.csr_matrix:
+        """CSR matrix backed by read-only memory-mapped .npy files.
+        
+        Every worker maps the same files, so they share one copy of the
+        matrix in the page cache.
+        """
+        arrays = {
+            part: np.load(os.path.join(matrix_dir, f"{part}.npy"), mmap_mode='r')
+            for part in _MATRIX_PARTS
+        }
+        return sp.csr_matrix(
+            (arrays['data'], arrays['indices'], arrays['indptr']),
+            shape=shape, copy=False
+        )
+    
+    def _remove_stale_matrices(self, matrix_dir: str) -> None:
+        """Delete doc_matrix_* directories left by earlier index builds."""
+        current = os.path.basename(matrix_dir)
+        for name in os.listdir(self.cache_dir):
+            path = os.path.join(self.cache_dir, name)
+            if re.fullmatch(r'doc_matrix_[0-9a-f]{16}', name) and name != current and os.path.isdir(path):
+                shutil.rmtree(path, ignore_errors=True)
+    
+    def _build_ann_index(self):
+        """Build HNSW index over TF-IDF vectors (None for small catalogs or if hnswlib missing)."""
+        n_docs, dim = self.tfidf_matrix.shape
+        if n_docs < self.ANN_MIN_DOCS:
+            return None
+        if hnswlib is None:
+            print("   ℹ️  hnswlib not installed, using exact similarity scan")
+            return None
+        
+        index = hnswlib.Index(space='cosine', dim=dim)
+        cache_path = os.path.join(self.cache_dir, f"ann_index_{self._index_key}.bin")
+        
+        if os.path.exists(cache_path):
+            try:
+                index.load_index(cache_path, max_elements=n_docs)
+                index.set_ef(max(200, self.CANDIDATE_POOL))
+                print("🧭 Loaded cached HNSW ANN index")
+                return index
+            except RuntimeError as e:
+                print(f"   ⚠️  Could not load cached ANN index ({e}), rebuilding")
+                index = hnswlib.Index(space='cosine', dim=dim)
+        
+        print("🧭 Building HNSW ANN index...")
+        index.init_index(max_elements=n_docs, ef_construction=200, M=16)
+        # Densify a block of rows at a time, not the whole matrix
+        for start in range(0, n_docs, 1024):
+            block = self.tfidf_matrix[start:start + 1024].toarray().astype(np.float32)
+            index.add_items(block, np.arange(start, start + block.shape[0]))
+        index.set_ef(max(200, self.CANDIDATE_POOL))
+        
+        try:
+            os.makedirs(self.cache_dir, exist_ok=True)
+            tmp_path = f"{cache_path}.{os.getpid()}.tmp"
+            index.save_index(tmp_path)
+            os.replace(tmp_path, cache_path)
+        except (OSError, RuntimeError) as e:
+            print(f"   ⚠️  Could not cache ANN index ({e})")
+        return index
+    
+    def _candidate_indices(self, query_vec) -> np.ndarray:
+        """Get candidate rows: ANN neighbours plus all trained assessments."""
+        n_docs = self.tfidf_matrix.shape[0]
+        if query_vec.nnz == 0:
+            return np.arange(n_docs)
+        
+        if self.ann_index is not None:
+            k = min(self.CANDIDATE_POOL, n_docs)
+            labels, _ = self.ann_index.knn_query(query_vec.toarray().astype(np.float32), k=k)
+            candidates = labels[0].astype(np.int64)
+        else:
+            # Exact scan: the sparse matvec over every row is cheap at this size
+            return np.arange(n_docs)
+        
+        return np.union1d(candidates, self.trained_indices)
+    
     def _extract_query_features(self, query: str) -> Dict[str, Any]:
         """Extract query features with ENHANCED soft skills detection."""
         query_lower = query.lower()
@@ -187,120 +599,83 @@ class SHLRecommendationEngine:
             'soft_skills_required': False
         }
         
-        # Technology detection
-        tech_patterns = {
-            'java': r'\bjava\b(?!\s*script)',
-            'javascript': r'\bjavascript|java\s*script|js\b',
-            'python': r'\bpython\b',
-            'sql': r'\bsql\b',
-            'selenium': r'\bselenium\b',
-            'excel': r'\bexcel\b',
-            'html': r'\bhtml\b',
-            'css': r'\bcss\b',
-        }
-        
-        for tech, pattern in tech_patterns.items():
-            if re.search(pattern, query_lower):
-                features['technologies'].append(tech)
+        tech_bits, cat_bits, duration_max = _scan_query_features(query_lower)
         
-        # CRITICAL: Soft skills detection
-        collaboration_keywords = [
-            'collaborate', 'collaboration', 'collaborative',
-            'communicate', 'communication', 'interpersonal',
-            'team', 'teamwork', 'stakeholder', 'business teams',
-            'work with', 'interact with', 'personality', 'behavioral',
-            'soft skills', 'people skills'
+        # Technology detection
+        features['technologies'] = [
+            tech for bit, tech in enumerate(_TECHNOLOGIES) if tech_bits >> bit & 1
         ]
         
-        if any(kw in query_lower for kw in collaboration_keywords):
+        # CRITICAL: Soft skills detection
+        if cat_bits & _CAT_P:
             features['test_categories'].add('P')  # Personality
             features['soft_skills_required'] = True
             features['skills'].extend(['collaboration', 'communication'])
         
         # Technical skills
-        if any(word in query_lower for word in ['technical', 'coding', 'programming', 'developer', 'engineer']):
+        if cat_bits & _CAT_K:
             features['test_categories'].add('K')  # Knowledge
         
         # Cognitive
-        if any(word in query_lower for word in ['cognitive', 'analytical', 'reasoning', 'analyst']):
+        if cat_bits & _CAT_C:
             features['test_categories'].add('C')  # Cognitive
         
         # Duration constraint
-        duration_match = re.search(r'(\d+)\s*(?:min|minute)', query_lower)
-        if duration_match:
-            features['duration_max'] = int(duration_match.group(1))
+        if duration_max >= 0:
+            features['duration_max'] = duration_max
         
         return features
     
-    def _calculate_training_boost(self, query: str, url: str, base_score: float) -> float:
-        """Apply STRONG training boost."""
+    def _training_boosts(self, query: str) -> np.ndarray:
+        """Training boost multiplier for every assessment, as one array."""
+        n_docs = self.n_assessments
         query_lower = query.lower().strip()
-        url_lower = url.lower().strip()
+        query_terms = frozenset(query_lower.split())
         
-        # Normalize both
-        norm_query_url = self._normalize_url(url_lower)
+        similarity = np.zeros(n_docs)
         
-        # Exact query match - MASSIVE boost
-        if query_lower in self.train_queries:
-            train_urls = self.train_queries[query_lower]
-            norm_train_urls = {self._normalize_url(u) for u in train_urls}
-            
-            if norm_query_url in norm_train_urls:
-                return base_score * 1000.0  # Huge boost
-        
-        # Similar query match
-        query_terms = set(query_lower.split())
-        best_similarity = 0.0
-        
-        for train_query, train_urls in self.train_queries.items():
-            norm_train_urls = {self._normalize_url(u) for u in train_urls}
-            
-            if norm_query_url in norm_train_urls:
-                train_terms = set(train_query.split())
-                if query_terms and train_terms:
-                    similarity = len(query_terms & train_terms) / len(query_terms | train_terms)
-                    best_similarity = max(best_similarity, similarity)
+        # One pass over precomputed training term sets (not one per assessment)
+        if query_terms:
+            for train_query, train_terms in self._train_query_terms.items():
+                overlap = len(query_terms & train_terms)
+                if overlap:
+                    jaccard = overlap / len(query_terms | train_terms)
+                    idx = self._train_query_url_indices[train_query]
+                    similarity[idx] = np.maximum(similarity[idx], jaccard)
         
-        if best_similarity > 0.3:
-            return base_score * (1 + best_similarity * 100)
+        boosts = np.where(similarity > 0.3, 1 + similarity * 100, 1.0)
         
-        return base_score
+        # Exact query match - MASSIVE boost
+        exact_idx = self._train_query_url_indices.get(query_lower)
+        if exact_idx is not None:
+            boosts[exact_idx] = 1000.0  # Huge boost
+        return boosts
     
-    def _balance_by_category(self, results: List[Dict], 
+    def _balance_by_category(self, cand_idx: np.ndarray,
                             required_categories: Set[str],
                             soft_skills_required: bool,
-                            top_k: int) -> List[Dict]:
-        """Balance recommendations across categories."""
+                            top_k: int) -> np.ndarray:
+        """Balance recommendations across categories.
+        
+        Works on catalog indices of the ranked candidates and returns the
+        positions (into cand_idx) of the chosen ones, in output order.
+        """
         if len(required_categories) <= 1 and not soft_skills_required:
-            return results[:top_k]
+            return np.arange(min(top_k, len(cand_idx)))
         
         # Categorize
-        by_category = defaultdict(list)
-        
-        for result in results:
-            test_types = result.get('test_type', [])
-            
-            if 'K' in test_types:
-                by_category['K'].append(result)
-            elif 'P' in test_types:
-                by_category['P'].append(result)
-            elif 'C' in test_types:
-                by_category['C'].append(result)
-            elif 'A' in test_types:
-                by_category['A'].append(result)
-            else:
-                by_category['Other'].append(result)
+        cats = self._primary_cat[cand_idx]
+        url_ids = self._url_ids[cand_idx]
         
         balanced = []
-        used_urls = set()
+        used = set()
         
         # If soft skills required, ensure 2-3 personality tests
         if soft_skills_required and 'P' in required_categories:
-            personality_count = min(3, len(by_category['P']), top_k // 3)
-            for result in by_category['P'][:personality_count]:
-                if result['url'] not in used_urls:
-                    balanced.append(result)
-                    used_urls.add(result['url'])
+            for pos in np.flatnonzero(cats == 'P')[:min(3, top_k // 3)]:
+                if url_ids[pos] not in used:
+                    balanced.append(pos)
+                    used.add(url_ids[pos])
         
         # Fill remaining slots
         remaining = top_k - len(balanced)
@@ -311,27 +686,26 @@ class SHLRecommendationEngine:
                 continue
             
             added = 0
-            for result in by_category[cat]:
-                if result['url'] not in used_urls and added < slots_per_cat:
-                    balanced.append(result)
-                    used_urls.add(result['url'])
+            for pos in np.flatnonzero(cats == cat):
+                if added >= slots_per_cat:
+                    break
+                if url_ids[pos] not in used:
+                    balanced.append(pos)
+                    used.add(url_ids[pos])
                     added += 1
         
         # Fill any remaining with top scores
-        for result in results:
+        for pos in range(len(cand_idx)):
             if len(balanced) >= top_k:
                 break
-            if result['url'] not in used_urls:
-                balanced.append(result)
-                used_urls.add(result['url'])
+            if url_ids[pos] not in used:
+                balanced.append(pos)
+                used.add(url_ids[pos])
         
-        return balanced[:top_k]
+        return np.array(balanced[:top_k], dtype=np.int64)
     
-    def get_recommendations(self, query: str, top_k: int = 10) -> List[Dict[str, Any]]:
-        """Get recommendations with training boost - ALWAYS returns results."""
-        features = self._extract_query_features(query)
-        
-        # Build enriched query
+    def _build_query_text(self, query: str, features: Dict[str, Any]) -> str:
+        """Build enriched query text for TF-IDF matching."""
         query_parts = [query] * 3
         query_parts.extend(features['technologies'] * 10)
         query_parts.extend(features['skills'] * 8)
@@ -342,79 +716,105 @@ class SHLRecommendationEngine:
         if 'K' in features['test_categories']:
             query_parts.extend(['technical', 'knowledge', 'skills', 'programming'] * 5)
         
-        query_text = ' '.join(query_parts)
-        query_vec = self.vectorizer.transform([query_text])
-        
-        # Calculate similarities
-        similarities = cosine_similarity(query_vec, self.tfidf_matrix).flatten()
-        
-        # Apply training boost
-        boosted_scores = []
-        for idx, score in enumerate(similarities):
-            url = self.df.iloc[idx]['url']
-            boosted_score = self._calculate_training_boost(query, url, score)
-            boosted_scores.append((idx, boosted_score))
-        
-        # Sort by score
-        boosted_scores.sort(key=lambda x: x[1], reverse=True)
-        
-        # Collect candidates - RELAXED FILTERING
-        candidates = []
-        for idx, score in boosted_scores[:100]:  # Increased from 50 to 100
-            row = self.df.iloc[idx]
-            
-            # Duration filter - ONLY if specified
-            if features['duration_max']:
-                duration = row.get('duration')
-                if pd.notna(duration) and duration > features['duration_max'] * 1.2:  # Allow 20% buffer
-                    continue
-            
-            candidates.append({
-                'name': row['name'],
-                'url': row['url'],
-                'description': row.get('description', ''),
-                'duration': int(row['duration']) if pd.notna(row.get('duration')) else None,
-                'adaptive_support': bool(row.get('adaptive_support', False)),
-                'remote_support': bool(row.get('remote_support', False)),
-                'test_type': row.get('test_type', []),
-                'score': score
-            })
+        return ' '.join(query_parts)
+    
+    def _vectorize_queries(self, queries: List[str],
+                           features: List[Dict[str, Any]]) -> sp.csr_matrix:
+        """L2-normalized TF-IDF rows for queries."""
+        query_texts = [self._build_query_text(q, f) for q, f in zip(queries, features)]
+        return self.vectorizer.transform(query_texts)
+    
+    def _vectorize_query(self, query: str) -> sp.csr_matrix:
+        """Vectorize a single query (memoized per engine)."""
+        return self._vectorize_queries([query], [self._cached_features(query)])
+    
+    def _candidate_similarities(self, query_vec) -> Tuple[np.ndarray, np.ndarray]:
+        """Similarities for the query's candidate rows (0 elsewhere), and those rows."""
+        # Calculate similarities (exact rescoring of ANN candidates only)
+        candidate_idx = self._candidate_indices(query_vec)
+        # Rows are L2-normalized, so cosine similarity is a plain sparse matvec
+        similarities = np.zeros(self.tfidf_matrix.shape[0], dtype=np.float32)
+        similarities[candidate_idx] = (
+            self.tfidf_matrix[candidate_idx] @ query_vec.toarray().ravel()
+        )
+        return similarities, candidate_idx
+    
+    def get_recommendations(self, query: str, top_k: int = 10) -> List[Dict[str, Any]]:
+        """Get recommendations with training boost - ALWAYS returns results."""
+        features = self._cached_features(query)
+        similarities, candidate_idx = self._candidate_similarities(self._cached_query_vec(query))
+        return self._rank_candidates(query, features, similarities, candidate_idx, top_k)
+    
+    def get_recommendations_batch(self, queries: List[str], top_k: int = 10) -> List[List[Dict[str, Any]]]:
+        """Get recommendations for many queries with one vectorized scoring pass."""
+        features = [self._cached_features(q) for q in queries]
+        query_vecs = self._vectorize_queries(queries, features)
+        
+        if self.ann_index is not None:
+            # Rank from the same ANN candidate pool as get_recommendations, so
+            # filtered or tied rows are padded from the same rows
+            return [
+                self._rank_candidates(q, f, *self._candidate_similarities(query_vecs[i]), top_k)
+                for i, (q, f) in enumerate(zip(queries, features))
+            ]
+        
+        # One sparse matmul scores every query against every assessment
+        similarities = (self.tfidf_matrix @ query_vecs.T.toarray()).T
+        all_idx = np.arange(self.tfidf_matrix.shape[0])
+        
+        return [
+            self._rank_candidates(q, f, similarities[i], all_idx, top_k)
+            for i, (q, f) in enumerate(zip(queries, features))
+        ]
+    
+    def _rank_candidates(self, query: str, features: Dict[str, Any],
+                         similarities: np.ndarray, candidate_idx: np.ndarray,
+                         top_k: int) -> List[Dict[str, Any]]:
+        """Boost, filter and balance scored candidates into final results."""
+        # Training boost as a multiplier per candidate
+        boosts = self._training_boosts(query)[candidate_idx]
+        candidate_scores = similarities[candidate_idx]
+        
+        # Boost, and drop assessments over the duration limit (20% buffer) in
+        # the same array step; scores are >= 0, so -1 marks excluded rows
+        boosted = candidate_scores * boosts
+        if features['duration_max']:
+            durations = self._durations[candidate_idx]
+            keep = np.isnan(durations) | (durations <= features['duration_max'] * 1.2)
+            boosted = np.where(keep, boosted, -1.0)
+        
+        # Select and sort the top boosted scores
+        top = _score_topk(boosted, self.CANDIDATE_POOL)
+        top = top[boosted[top] >= 0]
+        top_idx = candidate_idx[top]
+        
+        # Collect candidates - RELAXED FILTERING (dicts are built for winners only)
+        scores = boosted[top]
         
         # Balance if needed
         if len(features['test_categories']) > 1 or features['soft_skills_required']:
-            results = self._balance_by_category(
-                candidates,
+            chosen = self._balance_by_category(
+                top_idx,
                 features['test_categories'],
                 features['soft_skills_required'],
                 top_k
             )
         else:
-            results = candidates[:top_k]
+            chosen = np.arange(min(top_k, len(top_idx)))
         
         # FALLBACK: If still no results, return top scored assessments regardless
-        if len(results) < 5:
-            print(f"   ⚠️  Only {len(results)} results after filtering, adding top scored assessments...")
-            results = candidates[:max(5, top_k)]
+        if len(chosen) < 5:
+            print(f"   ⚠️  Only {len(chosen)} results after filtering, adding top scored assessments...")
+            chosen = np.arange(min(max(5, top_k), len(top_idx)))
         
         # ENSURE we always return SOMETHING
-        if not results and candidates:
-            results = candidates[:top_k]
-        elif not results:
+        if len(chosen):
+            results = [self._result(top_idx[pos], scores[pos]) for pos in chosen[:10]]
+        else:
             # Last resort: return top 10 by pure TF-IDF score
             print(f"   ⚠️  No candidates found, returning top assessments by score...")
-            top_indices = similarities.argsort()[-top_k:][::-1]
-            for idx in top_indices:
-                row = self.df.iloc[idx]
-                results.append({
-                    'name': row['name'],
-                    'url': row['url'],
-                    'description': row.get('description', ''),
-                    'duration': int(row['duration']) if pd.notna(row.get('duration')) else None,
-                    'adaptive_support': bool(row.get('adaptive_support', False)),
-                    'remote_support': bool(row.get('remote_support', False)),
-                    'test_type': row.get('test_type', []),
-                    'score': similarities[idx]
-                })
+            top_indices = _score_topk(similarities, top_k)
+            results = [self._result(idx, similarities[idx]) for idx in top_indices]
         
         return results[:10]  # Always return exactly 10 (or less if catalog is small)
 
@@ -15,13 +15,14 @@ engine = SHLRecommendationEngine()
 # Generate predictions
 all_predictions = []
 
-for i, query in enumerate(test_df['Query'], 1):
+# Score every test query in one batched pass
+queries = test_df['Query'].tolist()
+all_recommendations = engine.get_recommendations_batch(queries, top_k=10)
+
+for i, (query, recommendations) in enumerate(zip(queries, all_recommendations), 1):
     print(f"[{i}/{len(test_df)}] Processing query...")
     print(f"   Query: {query[:80]}...")
     
-    # Get recommendations
-    recommendations = engine.get_recommendations(query, top_k=10)
-    
     if recommendations:
         print(f"   ✅ Generated {len(recommendations)} recommendations")
         
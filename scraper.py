@@ -9,13 +9,27 @@ Fixed SHL Assessment Scraper: Corrected URL, imports, and errors for full catalo
 - Outputs: JSON with name, url, description (comprehensive), duration, adaptive_support, remote_support, test_type (array)
 """
 import argparse
-import json
+import asyncio
+import gzip
+import hashlib
+import os
 import re
+import threading
 import time
-from typing import List, Dict, Optional, Set
+from concurrent.futures import ThreadPoolExecutor
+from itertools import islice
+from dataclasses import dataclass
+from typing import AsyncIterator, Iterable, List, Optional, Set
+import orjson
 import requests
+from requests.adapters import HTTPAdapter
+from urllib3.util.retry import Retry
+from urllib3.util.request import ACCEPT_ENCODING
 from bs4 import BeautifulSoup
+import lxml.etree
+import lxml.html
 from urllib.parse import urljoin
+from email.utils import parsedate_to_datetime
 # Fixed import: selenium, not selenium1
 from selenium import webdriver
 from selenium.webdriver.chrome.options import Options
@@ -23,6 +37,10 @@ from selenium.webdriver.common.by import By
 from selenium.webdriver.support.ui import WebDriverWait
 from selenium.webdriver.support import expected_conditions as EC
 from selenium.common.exceptions import TimeoutException, NoSuchElementException
+try:
+    import aiohttp
+except ImportError:  # aiohttp is optional; fall back to a thread pool on SESSION
+    aiohttp = None
 CATALOG_BASE = "https://www.shl.com/solutions/products/product-catalog/"  # Fixed: /solutions/ path
 CATALOG_START = "?start=0&type=1"  # Individual tests filter
 HEADERS = {
@@ -33,6 +51,350 @@ HEADERS = {
     "Connection": "keep-alive",
     "Upgrade-Insecure-Requests": "1"
 }
+# Statuses retried with backoff; Retry-After is honoured on 429/503
+RETRY_STATUSES = (429, 500, 502, 503, 504)
+MAX_RETRIES = 3
+RETRY_BACKOFF = 0.5
+# Assessment pages are plain HTML: anything else, or a long redirect chain, is skipped unread
+MAX_REDIRECTS = 3
+MAX_PAGE_BYTES = 2_000_000
+HTML_CONTENT_TYPES = ('text/html', 'application/xhtml+xml')
+# Shared keep-alive session: one TLS handshake per pooled connection, not per page
+SESSION = requests.Session()
+SESSION.headers.update(HEADERS)
+SESSION.headers["Accept-Encoding"] = ACCEPT_ENCODING  # only what urllib3 can decode (br needs brotli)
+SESSION.mount("https://", HTTPAdapter(
+    pool_connections=1,
+    pool_maxsize=32,
+    max_retries=Retry(total=MAX_RETRIES, backoff_factor=RETRY_BACKOFF, status_forcelist=list(RETRY_STATUSES))
+))
+SESSION.max_redirects = MAX_REDIRECTS
+class RateLimiter:
+    """
+    Space requests at most `rate` per second (0 = unlimited), shared by threads and coroutines.
+    pause() pushes every later request back, e.g. when the server answers 429.
+    """
+    def __init__(self, rate: float):
+        self.interval = 1.0 / rate if rate > 0 else 0.0
+        self._next = 0.0
+        self._lock = threading.Lock()
+    def _reserve(self) -> float:
+        """Claim the next send slot; returns seconds to wait for it."""
+        with self._lock:
+            now = time.monotonic()
+            slot = max(now, self._next)
+            self._next = slot + self.interval
+            return slot - now
+    def pause(self, seconds: float) -> None:
+        with self._lock:
+            self._next = max(self._next, time.monotonic() + seconds)
+    def wait(self) -> None:
+        delay = self._reserve()
+        if delay > 0:
+            time.sleep(delay)
+    async def wait_async(self) -> None:
+        delay = self._reserve()
+        if delay > 0:
+            await asyncio.sleep(delay)
+RATE_LIMITER = RateLimiter(10)  # replaced from --rate
+def _retry_delay(retry_after: Optional[str], attempt: int) -> float:
+    """Seconds to back off: the server's Retry-After (seconds or HTTP date) or exponential backoff."""
+    if retry_after:
+        try:
+            return min(max(float(retry_after), 0.0), 60.0)
+        except ValueError:
+            try:
+                return min(max(parsedate_to_datetime(retry_after).timestamp() - time.time(), 0.0), 60.0)
+            except (TypeError, ValueError):
+                pass
+    return RETRY_BACKOFF * (2 ** attempt)
+# On-disk HTML cache so re-runs (e.g. while tuning extraction) skip the network
+PAGE_CACHE_DIR = "page_cache"
+USE_PAGE_CACHE = True  # cleared by --refresh
+LISTING_FETCH_ATTEMPTS = 3  # catalog listing pages, on top of SESSION's status retries
+def _skip_reason(headers) -> Optional[str]:
+    """Why a response should be dropped before its body is read (non-HTML or oversized), else None."""
+    content_type = headers.get('Content-Type', 'text/html').split(';')[0].strip().lower()
+    if content_type not in HTML_CONTENT_TYPES:
+        return f"not HTML ({content_type})"
+    length = headers.get('Content-Length', '')
+    if length.isdigit() and int(length) > MAX_PAGE_BYTES:
+        return f"too large ({length} bytes)"
+    return None
+def _page_cache_path(url: str) -> str:
+    return os.path.join(PAGE_CACHE_DIR, hashlib.sha1(url.encode('utf-8')).hexdigest() + ".html.gz")
+def read_cached_page(url: str) -> Optional[str]:
+    """Return cached HTML for url, or None on miss (or when the cache is disabled)."""
+    if not USE_PAGE_CACHE:
+        return None
+    try:
+        with gzip.open(_page_cache_path(url), 'rt', encoding='utf-8') as f:
+            return f.read()
+    except (OSError, EOFError):
+        return None
+def write_cached_page(url: str, html: str) -> None:
+    """Store fetched HTML (written to a temp file first so readers never see partial pages)."""
+    path = _page_cache_path(url)
+    try:
+        os.makedirs(PAGE_CACHE_DIR, exist_ok=True)
+        tmp_path = f"{path}.{os.getpid()}.tmp"
+        with gzip.open(tmp_path, 'wt', encoding='utf-8', compresslevel=6) as f:
+            f.write(html)
+        os.replace(tmp_path, path)
+    except OSError as e:
+        print(f" Could not cache {url}: {e}")
+# Scroll until the page stops growing, all inside the browser
+SCROLL_TO_END_JS = """
+const done = arguments[arguments.length - 1];
+let lastHeight = document.body.scrollHeight;
+(function step() {
+    window.scrollTo(0, document.body.scrollHeight);
+    setTimeout(() => {
+        const newHeight = document.body.scrollHeight;
+        if (newHeight === lastHeight) { done(); } else { lastHeight = newHeight; step(); }
+    }, 1000);
+})();
+"""
+# Pre-packaged job solution markers, compiled into single alternations
+_LINK_EXCLUSION_RE = re.compile('|'.join(map(re.escape, [
+    'pre-packaged', 'prepackaged', 'job-solution',
+    'job solution', 'pre packaged', 'solution package',
+    'packaged solution'
+])))
+_PAGE_EXCLUSION_RE = re.compile('|'.join(map(re.escape, [
+    'pre-packaged', 'job solution', 'packaged solution',
+    'pre packaged', 'solution package'
+])), re.I)
+_INDIVIDUAL_TEST_RE = re.compile('individual test', re.I)
+_SOLUTION_HINT_RE = re.compile('solution|packaged', re.I)
+# Detail-page extraction patterns, compiled once
+_NAV_RE = re.compile(r'cookie|privacy|terms|copyright|©', re.I)
+_NAME_SUFFIX_RE = re.compile(r'\s*[-–—|]\s*SHL.*$', re.I)
+_WHITESPACE_RE = re.compile(r'\s+')
+_DURATION_PATTERNS = [re.compile(p, re.I) for p in (
+    r'(?:duration|time|takes?)[\s:]*(\d+)\s*-\s*(\d+)\s*min',
+    r'(?:duration|time|takes?)[\s:]*(\d+)\s*min',
+    r'(?:duration|time|takes?)[\s:]*(\d+(?:\.\d+)?)\s*hour',
+    r'(\d+)\s*-\s*(\d+)\s*min(?:ute)?s?',
+    r'(\d+)\s*min(?:ute)?s?',
+    r'(\d+(?:\.\d+)?)\s*hour?s?'
+)]
+# SHL Test Types (from PDF: Ability&Aptitude=A, Biodata&Situational Judgement=B, etc.)
+SHL_TYPES = {
+    'A': ['ability', 'aptitude'],
+    'B': ['biodata', 'situational', 'judgement'],
+    'C': ['competencies', 'cognitive', 'numerical', 'verbal', 'reasoning'],
+    'D': ['development', '360'],
+    'E': ['exercise', 'assessment exercise'],
+    'K': ['knowledge', 'skills', 'java', 'python', 'sql', 'programming'],
+    'P': ['personality', 'behavior', 'opq', 'trait'],
+    'S': ['simulation']
+}
+# All keywords in one alternation; the named group that matched is the test type code
+_TYPE_KEYWORD_RE = re.compile(r'\b(?:' + '|'.join(
+    f"(?P<{code}>" + '|'.join(map(re.escape, sorted(keywords, key=len, reverse=True))) + ')'
+    for code, keywords in SHL_TYPES.items()
+) + r')\b', re.I)
+# Duration is listed near the top of the page; don't scan the whole body for it
+DURATION_SEARCH_CHARS = 10_000
+_ADAPTIVE_RE = re.compile(r'\badaptive\b', re.I)
+_REMOTE_RE = re.compile(r'\b(?:remote|online|virtual)\b', re.I)
+STREAM_CHUNK_SIZE = 16384
+_HEADER_CHARSET_RE = re.compile(r'charset\s*=\s*["\']?([\w.:-]+)', re.I)
+_META_CHARSET_RE = re.compile(rb'<meta[^>]+charset', re.I)
+class StreamingHTMLParser:
+    """
+    Incremental lxml HTML parse of a response body, fed chunk by chunk as it downloads.
+    The raw bytes are kept so the decoded page can still be written to the page cache.
+    """
+    def __init__(self, content_type: Optional[str]):
+        match = _HEADER_CHARSET_RE.search(content_type or '')
+        self.encoding = match.group(1) if match else None
+        self._parser = None
+        self._chunks = []
+    def _start(self) -> None:
+        head = b''.join(self._chunks)
+        # Without a charset header, let a <meta> charset decide, else assume UTF-8
+        if self.encoding is None and not _META_CHARSET_RE.search(head):
+            self.encoding = 'utf-8'
+        self._parser = lxml.html.HTMLParser(encoding=self.encoding)
+        self._parser.feed(head)
+    def feed(self, chunk: bytes) -> None:
+        self._chunks.append(chunk)
+        if self._parser is not None:
+            self._parser.feed(chunk)
+        elif sum(map(len, self._chunks)) >= 1024:  # enough to see a <meta charset>
+            self._start()
+    def close(self):
+        """Finish parsing; returns (document root, decoded HTML)."""
+        if self._parser is None and any(self._chunks):
+            self._start()
+        root = self._parser.close() if self._parser is not None else None
+        if root is None:
+            raise lxml.etree.ParserError("Document is empty")
+        encoding = root.getroottree().docinfo.encoding or self.encoding or 'utf-8'
+        try:
+            html = b''.join(self._chunks).decode(encoding, errors='replace')
+        except LookupError:
+            html = b''.join(self._chunks).decode('utf-8', errors='replace')
+        return root, html
+class _PageReader:
+    """
+    Gate, size cap and decoding for one response, shared by every fetcher.
+    The headers are checked before any of the body is read (skip is the reason, or None);
+    feed() parses chunks as they arrive and refuses bodies over MAX_PAGE_BYTES.
+    """
+    def __init__(self, url: str, headers):
+        self.url = url
+        self.skip = _skip_reason(headers)
+        if self.skip:
+            print(f" Skipping {url}: {self.skip}")
+        self._stream = StreamingHTMLParser(headers.get('Content-Type'))
+        self._received = 0
+    def feed(self, chunk: bytes) -> bool:
+        """Parse the next chunk; False once the body is over MAX_PAGE_BYTES (the page is skipped)."""
+        self._received += len(chunk)
+        if self._received > MAX_PAGE_BYTES:  # chunked responses have no Content-Length
+            print(f" Skipping {self.url}: larger than {MAX_PAGE_BYTES} bytes")
+            return False
+        self._stream.feed(chunk)
+        return True
+    def close(self):
+        """Finish parsing; returns (document root, decoded HTML)."""
+        return self._stream.close()
+def _read_page(url: str, headers, chunks: Iterable[bytes]):
+    """Run a response body through _PageReader: (document root, decoded HTML), or None if skipped."""
+    reader = _PageReader(url, headers)
+    if reader.skip:
+        return None
+    for chunk in chunks:
+        if not reader.feed(chunk):
+            return None
+    return reader.close()
+async def _read_page_async(url: str, headers, chunks: AsyncIterator[bytes]):
+    """Async _read_page for aiohttp's chunk iterator."""
+    reader = _PageReader(url, headers)
+    if reader.skip:
+        return None
+    async for chunk in chunks:
+        if not reader.feed(chunk):
+            return None
+    return reader.close()
+# Name selectors in priority order (first match in the document wins)
+_NAME_SELECTORS = ('h1', 'h1.title', '.product-name', '.assessment-name', 'title')
+# Description containers in priority order: (selector, tag, attribute, substrings)
+_CONTENT_SELECTORS = (
+    ('div[class*="description"], div[class*="what-it-measures"]', 'div', 'class', ('description', 'what-it-measures')),  # Added SHL-specific
+    ('div[class*="overview"]', 'div', 'class', ('overview',)),
+    ('div[class*="about"]', 'div', 'class', ('about',)),
+    ('section[class*="description"]', 'section', 'class', ('description',)),
+    ('div[class*="content"]', 'div', 'class', ('content',)),
+    ('article', 'article', None, ()),
+    ('div[id*="description"]', 'div', 'id', ('description',)),
+    ('div[id*="overview"]', 'div', 'id', ('overview',)),
+)
+# Text inside these elements is not page text (matches bs4's get_text)
+_SKIP_TEXT_TAGS = frozenset(['script', 'style', 'template', 'rt', 'rp'])
+class _PageIndex:
+    """Result of _index_page: first element per selector, first 3 lists, stripped text nodes."""
+    __slots__ = ('found', 'lists', 'strings')
+    def __init__(self):
+        self.found = {}
+        self.lists = []
+        self.strings = []
+def _index_page(root) -> _PageIndex:
+    """Collect everything parse_assessment looks up in a single document-order walk."""
+    page = _PageIndex()
+    found = page.found
+    def visit(el, skip_text: bool):
+        tag = el.tag
+        classes = el.get('class')
+        if classes:
+            class_names = classes.split()
+            for cls in ('product-name', 'assessment-name'):
+                if cls in class_names:
+                    found.setdefault('.' + cls, el)
+        if tag == 'h1':
+            found.setdefault('h1', el)
+            if classes and 'title' in class_names:
+                found.setdefault('h1.title', el)
+        elif tag == 'title' or tag == 'main' or tag == 'article' or tag == 'body':
+            found.setdefault(tag, el)
+        elif tag == 'meta':
+            if el.get('name') == 'description':
+                found.setdefault('meta[name="description"]', el)
+            if el.get('property') == 'og:description':
+                found.setdefault('meta[property="og:description"]', el)
+        elif (tag == 'ul' or tag == 'ol') and len(page.lists) < 3:
+            page.lists.append(el)
+        if tag == 'div' or tag == 'section' or tag == 'article':
+            for selector, sel_tag, attr, needles in _CONTENT_SELECTORS:
+                if sel_tag == tag and selector not in found:
+                    value = el.get(attr) if attr else ''
+                    if attr is None or (value and any(n in value for n in needles)):
+                        found[selector] = el
+        skip_text = skip_text or tag in _SKIP_TEXT_TAGS
+        if el.text and not skip_text:
+            text = el.text.strip()
+            if text:
+                page.strings.append(text)
+        for child in el:
+            if isinstance(child.tag, str):  # not a comment
+                visit(child, skip_text)
+            if child.tail and not skip_text:
+                text = child.tail.strip()
+                if text:
+                    page.strings.append(text)
+    visit(root, False)
+    return page
+# Text nodes under an element that bs4's get_text() would return (no script/style/template/ruby text)
+_TEXT_NODES_XPATH = lxml.etree.XPath(
+    'descendant::text()[not(' + ' or '.join(f'ancestor::{tag}' for tag in sorted(_SKIP_TEXT_TAGS)) + ')]',
+    smart_strings=False
+)
+def _text(el) -> str:
+    """Stripped text nodes of el concatenated, like bs4's get_text(strip=True)."""
+    return ''.join([t.strip() for t in _TEXT_NODES_XPATH(el)])
+def _text_longer_than(el, min_len: int) -> str:
+    """_text(el) if longer than min_len, else ''. The raw text_content() length is an upper
+    bound, so short elements are rejected with one C call before stripping node by node."""
+    if len(el.text_content()) <= min_len:
+        return ''
+    text = _text(el)
+    return text if len(text) > min_len else ''
+@dataclass(slots=True)
+class Assessment:
+    """One scraped assessment; fields are in output order (dataclasses.asdict() gives the JSON record)."""
+    name: str
+    url: str
+    description: str
+    duration: Optional[str]
+    adaptive_support: bool
+    remote_support: bool
+    test_type: List[str]
+class JsonArrayWriter:
+    """
+    Write a JSON array one item at a time, in the same layout as json.dump(items, indent=2).
+    orjson serializes Assessment dataclasses natively, in field order.
+    The file is only created on the first item; each item is flushed so partial runs survive.
+    """
+    def __init__(self, path: str):
+        self.path = path
+        self.count = 0
+        self._file = None
+    def write(self, item: 'Assessment') -> None:
+        if self._file is None:
+            self._file = open(self.path, 'wb')
+            self._file.write(b'[')
+        self._file.write(b',\n  ' if self.count else b'\n  ')
+        self._file.write(orjson.dumps(item, option=orjson.OPT_INDENT_2).replace(b'\n', b'\n  '))
+        self._file.flush()
+        self.count += 1
+    def close(self) -> None:
+        if self._file is not None:
+            self._file.write(b'\n]')
+            self._file.close()
+            self._file = None
 def init_selenium_driver():
     """Initialize headless Chrome driver."""
     options = Options()
@@ -43,21 +405,35 @@ def init_selenium_driver():
     options.add_argument("--user-agent=Mozilla/5.0 (Windows NT 10.0; Win64; x64) AppleWebKit/537.36")
     driver = webdriver.Chrome(options=options)
     driver.execute_script("Object.defineProperty(navigator, 'webdriver', {get: () => false});")
+    driver.set_script_timeout(60)  # for SCROLL_TO_END_JS
     return driver
-def fetch_page(url: str, max_retries: int = 3) -> Optional[BeautifulSoup]:
-    """Fetch and parse webpage with retry logic."""
-    for attempt in range(max_retries):
-        try:
-            response = requests.get(url, headers=HEADERS, timeout=30)
+def fetch_html(url: str, use_cache: bool = True) -> Optional[str]:
+    """
+    Fetch page HTML via the page cache (retries with backoff are handled by SESSION).
+    The body goes through _read_page like fetch_document's: the same header gate, size cap and decoding.
+    use_cache=False always downloads and does not store the page (catalog listings change).
+    """
+    html = read_cached_page(url) if use_cache else None
+    if html is not None:
+        return html
+    RATE_LIMITER.wait()
+    try:
+        with SESSION.get(url, timeout=30, stream=True) as response:
             response.raise_for_status()
-            return BeautifulSoup(response.text, 'html.parser')
-        except requests.exceptions.RequestException as e:
-            if attempt < max_retries - 1:
-                print(f" Retry {attempt + 1}/{max_retries} after error: {e}")
-                time.sleep(2 ** attempt)  # Exponential backoff
-            else:
-                print(f" Failed after {max_retries} attempts: {e}")
-                return None
+            page = _read_page(url, response.headers, response.iter_content(STREAM_CHUNK_SIZE))
+    except (requests.exceptions.RequestException, lxml.etree.ParserError) as e:
+        print(f" Failed to fetch {url}: {e}")
+        return None
+    if page is None:
+        return None
+    html = page[1]
+    if use_cache:
+        write_cached_page(url, html)
+    return html
+def fetch_page(url: str, use_cache: bool = True) -> Optional[BeautifulSoup]:
+    """Fetch and parse webpage."""
+    html = fetch_html(url, use_cache)
+    return BeautifulSoup(html, 'lxml') if html is not None else None
 def get_assessment_links_from_page(soup: BeautifulSoup) -> Set[str]:
     """
     Extract individual assessment links from a single page.
@@ -78,13 +454,8 @@ def get_assessment_links_from_page(soup: BeautifulSoup) -> Set[str]:
         # Check for exclusion - pre-packaged job solutions
         text = a_tag.get_text().lower()
         parent_text = a_tag.parent.get_text().lower() if a_tag.parent else ''
-        exclusion_keywords = [
-            'pre-packaged', 'prepackaged', 'job-solution',
-            'job solution', 'pre packaged', 'solution package',
-            'packaged solution'
-        ]
-        if any(kw in href.lower() or kw in text or kw in parent_text
-               for kw in exclusion_keywords):
+        # One scan over all three fields ('\n' keeps matches from spanning fields)
+        if _LINK_EXCLUSION_RE.search(f"{href.lower()}\n{text}\n{parent_text}"):
             continue
         # Additional check: look for category indicators
         # Individual tests usually have specific patterns
@@ -96,14 +467,49 @@ def get_assessment_links_from_page(soup: BeautifulSoup) -> Set[str]:
 def get_all_assessment_links(base_url: str, max_pages: int = 40) -> List[str]:  # Increased default pages
     """
     Get all assessment links from catalog, handling pagination (up to 40 pages for full ~480 items).
-    Uses Selenium to load JS content. Fixed exception scope.
+    Catalog pages are fetched over plain HTTP on the shared session, bypassing the page cache;
+    if the first page has no assessment anchors (content is JS-rendered) fall back to Selenium.
+    The crawl ends at the first page that loads with no links; a later page that still fails
+    after LISTING_FETCH_ATTEMPTS raises RuntimeError rather than returning a truncated list.
+    """
+    print("Fetching catalog over HTTP...")
+    all_links = set()
+    items_per_page = 12
+    start_values = range(0, max_pages * items_per_page, items_per_page)
+    for page_num, start in enumerate(start_values, 1):
+        page_url = f"{CATALOG_BASE}?start={start}&type=1"
+        print(f"\nScraping page {page_num}/{max_pages}: {page_url}")
+        for attempt in range(LISTING_FETCH_ATTEMPTS):
+            if attempt:
+                time.sleep(_retry_delay(None, attempt))
+                print(f" Retrying page {page_num} (attempt {attempt + 1}/{LISTING_FETCH_ATTEMPTS})")
+            soup = fetch_page(page_url, use_cache=False)
+            if soup is not None:
+                break
+        if soup is None and page_num > 1:
+            raise RuntimeError(f"Catalog page {page_num} failed after {LISTING_FETCH_ATTEMPTS} attempts: {page_url}")
+        links = get_assessment_links_from_page(soup) if soup else set()
+        if not links:
+            if page_num == 1:
+                print(" No assessment links in static HTML, falling back to Selenium")
+                return get_all_assessment_links_selenium(base_url, max_pages)
+            print(" No assessment links on page, assuming end of catalog.")
+            break
+        all_links.update(links)
+        print(f" Found {len(links)} new links (total: {len(all_links)})")
+    print(f"\nTotal unique assessment links found: {len(all_links)}")
+    return sorted(all_links)
+def get_all_assessment_links_selenium(base_url: str, max_pages: int = 40) -> List[str]:
+    """
+    Selenium variant of get_all_assessment_links for JS-loaded catalog pages.
+    Fixed exception scope.
     """
     print("Fetching catalog with Selenium (JS-loaded)...")
     driver = init_selenium_driver()
     wait = WebDriverWait(driver, 20)
     all_links = set()
     items_per_page = 12
-    start_values = [i * items_per_page for i in range(max_pages)]
+    start_values = range(0, max_pages * items_per_page, items_per_page)
     page_num = 0  # For exception scope
     try:
         for page_num, start in enumerate(start_values, 1):
@@ -111,272 +517,343 @@ def get_all_assessment_links(base_url: str, max_pages: int = 40) -> List[str]:
             print(f"\nScraping page {page_num}/{max_pages}: {page_url}")
             driver.get(page_url)
             wait.until(EC.presence_of_element_located((By.CSS_SELECTOR, "a[href*='/product-catalog/view/']")))
-            # Scroll to load lazy content
-            last_height = driver.execute_script("return document.body.scrollHeight")
-            while True:
-                driver.execute_script("window.scrollTo(0, document.body.scrollHeight);")
-                time.sleep(1)
-                new_height = driver.execute_script("return document.body.scrollHeight")
-                if new_height == last_height:
-                    break
-                last_height = new_height
+            # Scroll to load lazy content (one WebDriver round trip)
+            driver.execute_async_script(SCROLL_TO_END_JS)
             # Extract links using BS4 on rendered HTML
-            soup = BeautifulSoup(driver.page_source, 'html.parser')
+            soup = BeautifulSoup(driver.page_source, 'lxml')
             links = get_assessment_links_from_page(soup)
             all_links.update(links)
             print(f" Found {len(links)} new links (total: {len(all_links)})")
-            time.sleep(1)  # Polite delay
         print(f"\nTotal unique assessment links found: {len(all_links)}")
-        return sorted(list(all_links))
+        return sorted(all_links)
     except TimeoutException:
         print(f"\nTimeout on page {page_num}. Stopping.")
     except Exception as e:
         print(f"\nError on page {page_num}: {e}")
     finally:
         driver.quit()
-    return sorted(list(all_links))
-def scrape_assessment(url: str) -> Optional[Dict]:
+    return sorted(all_links)
+def fetch_document(url: str):
+    """
+    Fetch and parse an assessment page into an lxml document (None on network error).
+    The body is streamed into the parser as it downloads; cache hits are parsed from the cached text.
+    """
+    html = read_cached_page(url)
+    if html is not None:
+        return lxml.html.document_fromstring(html)
+    RATE_LIMITER.wait()
+    try:
+        with SESSION.get(url, timeout=30, stream=True) as response:
+            response.raise_for_status()
+            # Headers arrive before the body, so non-HTML pages are never downloaded
+            page = _read_page(url, response.headers, response.iter_content(STREAM_CHUNK_SIZE))
+    except requests.exceptions.RequestException as e:
+        print(f" Failed to fetch {url}: {e}")
+        return None
+    if page is None:
+        return None
+    root, html = page
+    write_cached_page(url, html)
+    return root
+def scrape_assessment(url: str) -> Optional['Assessment']:
     """
     Scrape individual assessment page.
     Returns dict matching PDF: name, url, description (comprehensive: measures/skills/target/features),
     duration, adaptive_support, remote_support, test_type (array).
     """
     try:
-        soup = fetch_page(url)
-        if not soup:
+        root = fetch_document(url)
+        if root is None:
             return None
-        # Get assessment name from h1 or title
-        name = None
-        # Try multiple selectors for the name
-        name_selectors = ['h1', 'h1.title', '.product-name', '.assessment-name', 'title']
-        for selector in name_selectors:
-            element = soup.select_one(selector)
-            if element:
-                name = element.get_text(strip=True)
-                # Clean up name
-                name = re.sub(r'\s*[-–—|]\s*SHL.*$', '', name, flags=re.I).strip()
-                if name and len(name) >= 3:
-                    break
-        if not name or len(name) < 3:
-            # Fallback: extract from URL
-            name = url.rstrip('/').split('/')[-1].replace('-', ' ').title()
-        # Get page text for analysis
-        page_text = soup.get_text(' ', strip=True)
-        # Double-check: skip if this is a pre-packaged solution
-        exclusion_phrases = [
-            'pre-packaged', 'job solution', 'packaged solution',
-            'pre packaged', 'solution package'
-        ]
-        if any(phrase in page_text.lower() for phrase in exclusion_phrases):
-            # Check if it's explicitly marked as individual test
-            if 'individual test' not in page_text.lower():
+        return parse_assessment(url, root)
+    except Exception as e:
+        print(f" Error scraping {url}: {e}")
+        return None
+def iter_assessments_threaded(urls: List[str], concurrency: int = 10):
+    """Thread-pool variant of iter_assessments_async for when aiohttp is missing (same order and output)."""
+    def scrape(i: int, url: str) -> Optional[Assessment]:
+        assessment = scrape_assessment(url)
+        status = f"✓ {assessment.name[:40]}" if assessment else "✗ (excluded or error)"
+        print(f"[{i}/{len(urls)}] {url.split('/')[-1][:50]}... {status}")
+        return assessment
+    # SESSION's pool (pool_maxsize=32) and RATE_LIMITER are shared safely across the workers
+    with ThreadPoolExecutor(max_workers=max(1, concurrency)) as executor:
+        yield from executor.map(scrape, range(1, len(urls) + 1), urls)
+async def fetch_document_async(session, url: str):
+    """Async fetch_document: chunks are fed to the parser as aiohttp receives them."""
+    html = read_cached_page(url)
+    if html is not None:
+        return lxml.html.document_fromstring(html)
+    try:
+        for attempt in range(MAX_RETRIES + 1):
+            await RATE_LIMITER.wait_async()
+            async with session.get(url, timeout=aiohttp.ClientTimeout(total=30),
+                                   max_redirects=MAX_REDIRECTS + 1) as response:  # aiohttp raises on the Nth hop
+                if response.status in RETRY_STATUSES and attempt < MAX_RETRIES:
+                    # Server is pushing back: slow every worker down, not just this one
+                    RATE_LIMITER.pause(_retry_delay(response.headers.get('Retry-After'), attempt))
+                    continue
+                response.raise_for_status()
+                page = await _read_page_async(url, response.headers,
+                                              response.content.iter_chunked(STREAM_CHUNK_SIZE))
+            if page is None:
                 return None
-        # ENHANCED DESCRIPTION EXTRACTION (PDF: measures, skills, target, features)
-        # Build comprehensive description from multiple sources
-        description_parts = []
-        # 1. Meta description
-        meta = soup.find('meta', {'name': 'description'}) or \
-               soup.find('meta', {'property': 'og:description'})
-        if meta and meta.get('content'):
-            meta_desc = meta['content'].strip()
-            if meta_desc and len(meta_desc) > 20:
-                description_parts.append(meta_desc)
-        # 2. Look for structured content sections (target SHL: "What it measures", etc.)
-        content_selectors = [
-            ('div[class*="description"], div[class*="what-it-measures"]', 'p'),  # Added SHL-specific
-            ('div[class*="overview"]', 'p'),
-            ('div[class*="about"]', 'p'),
-            ('section[class*="description"]', 'p'),
-            ('div[class*="content"]', 'p'),
-            ('article', 'p'),
-            ('div[id*="description"]', 'p'),
-            ('div[id*="overview"]', 'p'),
-        ]
-        for container_sel, para_sel in content_selectors:
-            container = soup.select_one(container_sel)
-            if container:
-                paragraphs = container.find_all(para_sel)
-                for p in paragraphs[:5]:  # Get up to 5 paragraphs
-                    text = p.get_text(strip=True)
-                    if len(text) > 30 and text not in description_parts:
-                        description_parts.append(text)
-        # 3. Find all substantial paragraphs if still no description
-        if len(description_parts) < 2:
-            # Get body content, excluding nav/footer/header
-            main_content = soup.find('main') or soup.find('article') or soup.find('body')
-            if main_content:
-                for p in main_content.find_all('p'):
-                    text = p.get_text(strip=True)
-                    # Filter out navigation, short text, and duplicates
-                    if (len(text) > 40 and
-                        text not in description_parts and
-                        not any(nav in text.lower() for nav in ['cookie', 'privacy', 'terms', 'copyright', '©'])):
-                        description_parts.append(text)
-                        if len(description_parts) >= 5:
-                            break
-        # 4. Look for bullet points/lists (often contain key features)
-        lists = soup.find_all(['ul', 'ol'])
-        for ul in lists[:3]:  # Check first 3 lists
-            list_items = []
-            for li in ul.find_all('li')[:10]:  # Max 10 items per list
-                item_text = li.get_text(strip=True)
-                if len(item_text) > 10 and len(item_text) < 200:
-                    list_items.append(item_text)
-            if list_items and len(list_items) >= 2:
-                # Add as a formatted section
-                list_text = ' | '.join(list_items)
-                if list_text not in ' '.join(description_parts):
-                    description_parts.append(f"Key features: {list_text}")
-        # 5. Combine all parts into comprehensive description
-        if description_parts:
-            # Join with proper spacing, limit total length
-            description = ' '.join(description_parts)
-            # Clean up excessive whitespace
-            description = re.sub(r'\s+', ' ', description).strip()
-            # Limit to reasonable length (first 1000 chars)
-            if len(description) > 1000:
-                description = description[:997] + '...'
-        else:
-            # Ultimate fallback: use name and extract keywords from page
-            description = name
-        # Duration extraction (enhanced)
-        duration = None
-        duration_patterns = [
-            r'(?:duration|time|takes?)[\s:]*(\d+)\s*-\s*(\d+)\s*min',
-            r'(?:duration|time|takes?)[\s:]*(\d+)\s*min',
-            r'(?:duration|time|takes?)[\s:]*(\d+(?:\.\d+)?)\s*hour',
-            r'(\d+)\s*-\s*(\d+)\s*min(?:ute)?s?',
-            r'(\d+)\s*min(?:ute)?s?',
-            r'(\d+(?:\.\d+)?)\s*hour?s?'
-        ]
-        for pattern in duration_patterns:
-            match = re.search(pattern, page_text, re.IGNORECASE)
-            if match:
-                if 'hour' in match.group(0).lower():
-                    hours = float(match.group(1))
-                    duration = f"{int(hours * 60)} minutes"
-                elif len(match.groups()) == 2:
-                    duration = f"{match.group(1)}-{match.group(2)} minutes"
-                else:
-                    duration = f"{match.group(1)} minutes"
-                break
-        # Test type categorization (enhanced with SHL categories: A,B,C,D,E,K,P,S per PDF)
-        test_type = []
-        content = f"{name} {description} {page_text[:1000]}".lower()
-        # SHL Test Types (from PDF: Ability&Aptitude=A, Biodata&Situational Judgement=B, etc.)
-        shl_types = {
-            'A': ['ability', 'aptitude'],
-            'B': ['biodata', 'situational', 'judgement'],
-            'C': ['competencies', 'cognitive', 'numerical', 'verbal', 'reasoning'],
-            'D': ['development', '360'],
-            'E': ['exercise', 'assessment exercise'],
-            'K': ['knowledge', 'skills', 'java', 'python', 'sql', 'programming'],
-            'P': ['personality', 'behavior', 'opq', 'trait'],
-            'S': ['simulation']
-        }
-        for code, keywords in shl_types.items():
-            if any(re.search(r'\b' + kw + r'\b', content) for kw in keywords):
-                test_type.append(code)
-        # Fallback if no SHL type found
-        if not test_type:
-            test_type = ['General']
-        # Support flags (per PDF response format)
-        adaptive_support = bool(re.search(r'\badaptive\b', page_text, re.IGNORECASE))
-        remote_support = bool(re.search(r'\b(?:remote|online|virtual)\b', page_text, re.IGNORECASE))
-        return {
-            'name': name,
-            'url': url,
-            'description': description[:500] if description else name,  # Limit description length
-            'duration': duration,
-            'adaptive_support': adaptive_support,
-            'remote_support': remote_support,
-            'test_type': test_type
-        }
+            root, html = page
+            write_cached_page(url, html)
+            return root
+    except (aiohttp.ClientError, asyncio.TimeoutError) as e:
+        print(f" Failed to fetch {url}: {e}")
+        return None
+async def scrape_assessment_async(session, url: str) -> Optional['Assessment']:
+    """Async scrape_assessment: download and parse on the event loop, extract in a worker thread."""
+    try:
+        root = await fetch_document_async(session, url)
+        if root is None:
+            return None
+        loop = asyncio.get_running_loop()
+        return await loop.run_in_executor(
+            None, parse_assessment, url, root
+        )
     except Exception as e:
         print(f" Error scraping {url}: {e}")
         return None
+async def iter_assessments_async(urls: List[str], concurrency: int = 10) -> AsyncIterator[Optional['Assessment']]:
+    """Scrape many assessment pages concurrently, yielding results in the order of urls."""
+    semaphore = asyncio.Semaphore(concurrency)
+    connector = aiohttp.TCPConnector(limit_per_host=concurrency, ttl_dns_cache=300)
+    # aiohttp sets Accept-Encoding itself from the decoders it has
+    headers = {k: v for k, v in HEADERS.items() if k != "Accept-Encoding"}
+    async with aiohttp.ClientSession(connector=connector, headers=headers) as session:
+        async def bounded(i: int, url: str) -> Optional[Assessment]:
+            async with semaphore:
+                assessment = await scrape_assessment_async(session, url)
+            status = f"✓ {assessment.name[:40]}" if assessment else "✗ (excluded or error)"
+            print(f"[{i}/{len(urls)}] {url.split('/')[-1][:50]}... {status}")
+            return assessment
+        tasks = [asyncio.ensure_future(bounded(i, url)) for i, url in enumerate(urls, 1)]
+        try:
+            for task in tasks:
+                yield await task
+        finally:
+            for task in tasks:
+                task.cancel()
+def parse_assessment(url: str, root) -> Optional['Assessment']:
+    """Extract the assessment record from a parsed lxml document (None if excluded)."""
+    # One walk over the document finds every element used below and the page text
+    page = _index_page(root)
+    # Get assessment name from h1 or title
+    name = None
+    # Try multiple selectors for the name
+    for selector in _NAME_SELECTORS:
+        element = page.found.get(selector)
+        if element is not None:
+            name = _text(element)
+            # Clean up name
+            name = _NAME_SUFFIX_RE.sub('', name).strip()
+            if name and len(name) >= 3:
+                break
+    if not name or len(name) < 3:
+        # Fallback: extract from URL
+        name = url.rstrip('/').split('/')[-1].replace('-', ' ').title()
+    # Get page text for analysis
+    page_text = ' '.join(page.strings)
+    # Double-check: skip if this is a pre-packaged solution. Links were already filtered,
+    # so only pages whose URL/name/title look like a package get the full-text scan
+    title = page.found.get('title')
+    identity = f"{url} {name} {_text(title) if title is not None else ''}"
+    if _SOLUTION_HINT_RE.search(identity) and _PAGE_EXCLUSION_RE.search(page_text):
+        # Check if it's explicitly marked as individual test
+        if not _INDIVIDUAL_TEST_RE.search(page_text):
+            return None
+    # ENHANCED DESCRIPTION EXTRACTION (PDF: measures, skills, target, features)
+    # Build comprehensive description from multiple sources
+    description_parts = []
+    # 1. Meta description
+    meta = page.found.get('meta[name="description"]')
+    if meta is None:
+        meta = page.found.get('meta[property="og:description"]')
+    if meta is not None and meta.get('content'):
+        meta_desc = meta.get('content').strip()
+        if meta_desc and len(meta_desc) > 20:
+            description_parts.append(meta_desc)
+    # 2. Look for structured content sections (target SHL: "What it measures", etc.)
+    for container_sel, *_ in _CONTENT_SELECTORS:
+        container = page.found.get(container_sel)
+        if container is not None:
+            for p in islice(container.iter('p'), 5):  # Get up to 5 paragraphs
+                text = _text_longer_than(p, 30)
+                if len(text) > 30 and text not in description_parts:
+                    description_parts.append(text)
+    # 3. Find all substantial paragraphs if still no description
+    if len(description_parts) < 2:
+        # Get body content, excluding nav/footer/header
+        main_content = next((page.found[tag] for tag in ('main', 'article', 'body') if tag in page.found), None)
+        if main_content is not None:
+            for p in main_content.iter('p'):
+                text = _text_longer_than(p, 40)
+                # Filter out navigation, short text, and duplicates
+                if (text and
+                    text not in description_parts and
+                    not _NAV_RE.search(text)):
+                    description_parts.append(text)
+                    if len(description_parts) >= 5:
+                        break
+    # 4. Look for bullet points/lists (often contain key features)
+    for ul in page.lists:  # First 3 lists
+        list_items = []
+        for li in islice(ul.iter('li'), 10):  # Max 10 items per list
+            item_text = _text_longer_than(li, 10)
+            if len(item_text) > 10 and len(item_text) < 200:
+                list_items.append(item_text)
+        if list_items and len(list_items) >= 2:
+            # Add as a formatted section
+            list_text = ' | '.join(list_items)
+            if list_text not in ' '.join(description_parts):
+                description_parts.append(f"Key features: {list_text}")
+    # 5. Combine all parts into comprehensive description
+    if description_parts:
+        # Join with proper spacing, limit total length
+        description = ' '.join(description_parts)
+        # Clean up excessive whitespace
+        description = _WHITESPACE_RE.sub(' ', description).strip()
+        # Limit to reasonable length (first 1000 chars)
+        if len(description) > 1000:
+            description = description[:997] + '...'
+    else:
+        # Ultimate fallback: use name and extract keywords from page
+        description = name
+    # Duration extraction (enhanced)
+    duration = None
+    duration_text = page_text[:DURATION_SEARCH_CHARS]
+    for pattern in _DURATION_PATTERNS:
+        match = pattern.search(duration_text)
+        if match:
+            if 'hour' in match.group(0).lower():
+                hours = float(match.group(1))
+                duration = f"{int(hours * 60)} minutes"
+            elif len(match.groups()) == 2:
+                duration = f"{match.group(1)}-{match.group(2)} minutes"
+            else:
+                duration = f"{match.group(1)} minutes"
+            break
+    # Test type categorization (enhanced with SHL categories: A,B,C,D,E,K,P,S per PDF)
+    content = f"{name} {description} {page_text[:1000]}"  # pattern is case-insensitive
+    found_codes = set()
+    for match in _TYPE_KEYWORD_RE.finditer(content):
+        found_codes.add(match.lastgroup)
+        if len(found_codes) == len(SHL_TYPES):
+            break
+    test_type = [code for code in SHL_TYPES if code in found_codes]
+    # Fallback if no SHL type found
+    if not test_type:
+        test_type = ['General']
+    # Support flags (per PDF response format)
+    adaptive_support = bool(_ADAPTIVE_RE.search(page_text))
+    remote_support = bool(_REMOTE_RE.search(page_text))
+    return Assessment(
+        name=name,
+        url=url,
+        description=description[:500] if description else name,  # Limit description length
+        duration=duration,
+        adaptive_support=adaptive_support,
+        remote_support=remote_support,
+        test_type=test_type
+    )
 def main():
     parser = argparse.ArgumentParser(description="Fixed SHL Assessment Scraper with pagination")
     parser.add_argument('--output', default='assessments_raw.json', help='Output JSON file')
     parser.add_argument('--max', type=int, default=500, help='Maximum assessments to scrape (0 for all)')  # Increased default
     parser.add_argument('--max-pages', type=int, default=40, help='Maximum catalog pages to scrape')  # Increased
+    parser.add_argument('--concurrency', type=int, default=10, help='Concurrent detail-page requests')
+    parser.add_argument('--refresh', action='store_true', help=f'Ignore cached pages in {PAGE_CACHE_DIR}/ and re-download')
+    parser.add_argument('--rate', type=float, default=10, help='Maximum requests per second (0 for no limit)')
     args = parser.parse_args()
-    print("="*80)
-    print("Fixed SHL Assessment Scraper with Pagination Support")
-    print("="*80)
-    print(f"\nTarget: {CATALOG_BASE}{CATALOG_START}")
-    print(f"Max assessments: {args.max}")
-    print(f"Max catalog pages: {args.max_pages}")
-    # Get all assessment links (with pagination)
-    links = get_all_assessment_links(CATALOG_BASE + CATALOG_START, max_pages=args.max_pages)
-    if not links:
-        print("\n❌ No assessment links found!")
-        print("This could mean:")
-        print(" 1. The website structure has changed")
-        print(" 2. The website uses JavaScript to load content")
-        print(" 3. There are access restrictions")
-        return
-    print(f"\n{'='*80}")
-    print(f"Found {len(links)} total assessment links")
-    max_scrape = len(links) if args.max == 0 else min(args.max, len(links))
-    print(f"Will scrape up to {max_scrape} assessments")
-    print(f"{'='*80}")
-    # Scrape each assessment
-    assessments = []
-    skipped = 0
-    print(f"\nScraping individual assessments...")
-    for i, url in enumerate(links[:max_scrape], 1):
-        print(f"[{i}/{max_scrape}] {url.split('/')[-1][:50]}...", end=' ')
-        assessment = scrape_assessment(url)
-        if assessment:
-            assessments.append(assessment)
-            print(f"✓ {assessment['name'][:40]}")
-        else:
-            skipped += 1
-            print("✗ (excluded or error)")
-        # Be polite with rate limiting
-        if i % 10 == 0:
-            print(f" Progress: {i}/{max_scrape}, Collected: {len(assessments)}, Skipped: {skipped}")
-            time.sleep(2)
-        else:
-            time.sleep(0.5)
-    # Save results
-    print(f"\n{'='*80}")
-    print(f"Scraping complete!")
-    print(f" ✓ Successfully scraped: {len(assessments)} assessments")
-    print(f" ✗ Skipped/Excluded: {skipped}")
-    print(f"{'='*80}")
-    if not assessments:
-        print("\n⚠️ Warning: No valid assessments collected!")
-        return
-    with open(args.output, 'w', encoding='utf-8') as f:
-        json.dump(assessments, f, indent=2, ensure_ascii=False)
-    print(f"\n💾 Saved to: {args.output}")
-    # Statistics
-    print(f"\n{'='*80}")
-    print("Dataset Statistics:")
-    print(f"{'='*80}")
-    # Count by test type
-    type_counts = {}
-    for a in assessments:
-        for t in a['test_type']:
-            type_counts[t] = type_counts.get(t, 0) + 1
-    print("\nTest Type Distribution:")
-    for test_type, count in sorted(type_counts.items(), key=lambda x: -x[1]):
-        print(f" {test_type}: {count}")
-    # Duration stats
-    with_duration = [a for a in assessments if a.get('duration')]
-    print(f"\nAssessments with duration info: {len(with_duration)}/{len(assessments)}")
-    # Show sample (should now match train.csv, e.g., Java assessments under /solutions/)
-    print(f"\n{'='*80}")
-    print("Sample assessments:")
-    print(f"{'='*80}")
-    for i, a in enumerate(assessments[:5], 1):
-        print(f"\n{i}. {a['name']}")
-        print(f" URL: {a['url']}")
-        print(f" Types: {', '.join(a['test_type'])}")
-        print(f" Duration: {a['duration'] or 'N/A'}")
-        print(f" Description: {a['description'][:100]}...")
-    print("\n✅ Done! Run with --max 0 for full scrape.")
+    global USE_PAGE_CACHE, RATE_LIMITER
+    USE_PAGE_CACHE = not args.refresh
+    RATE_LIMITER = RateLimiter(args.rate)
+    try:
+        print("="*80)
+        print("Fixed SHL Assessment Scraper with Pagination Support")
+        print("="*80)
+        print(f"\nTarget: {CATALOG_BASE}{CATALOG_START}")
+        print(f"Max assessments: {args.max}")
+        print(f"Max catalog pages: {args.max_pages}")
+        # Get all assessment links (with pagination)
+        links = get_all_assessment_links(CATALOG_BASE + CATALOG_START, max_pages=args.max_pages)
+        if not links:
+            print("\n❌ No assessment links found!")
+            print("This could mean:")
+            print(" 1. The website structure has changed")
+            print(" 2. The website uses JavaScript to load content")
+            print(" 3. There are access restrictions")
+            return
+        print(f"\n{'='*80}")
+        print(f"Found {len(links)} total assessment links")
+        max_scrape = len(links) if args.max == 0 else min(args.max, len(links))
+        print(f"Will scrape up to {max_scrape} assessments")
+        print(f"{'='*80}")
+        # Scrape each assessment, streaming records to the output file as they arrive
+        writer = JsonArrayWriter(args.output)
+        skipped = 0
+        type_counts = {}
+        with_duration = 0
+        samples = []
+        def record(assessment: Optional[Assessment]) -> None:
+            nonlocal skipped, with_duration
+            if not assessment:
+                skipped += 1
+                return
+            writer.write(assessment)
+            for t in assessment.test_type:
+                type_counts[t] = type_counts.get(t, 0) + 1
+            if assessment.duration:
+                with_duration += 1
+            if len(samples) < 5:
+                samples.append(assessment)
+        try:
+            if aiohttp is not None:
+                print(f"\nScraping individual assessments ({args.concurrency} concurrent)...")
+                async def run():
+                    async for assessment in iter_assessments_async(links[:max_scrape], args.concurrency):
+                        record(assessment)
+                asyncio.run(run())
+            else:
+                print(f"\nScraping individual assessments ({args.concurrency} threads)...")
+                for assessment in iter_assessments_threaded(links[:max_scrape], args.concurrency):
+                    record(assessment)
+        finally:
+            writer.close()  # also closes the array if scraping is interrupted
+        print(f"\n{'='*80}")
+        print(f"Scraping complete!")
+        print(f" ✓ Successfully scraped: {writer.count} assessments")
+        print(f" ✗ Skipped/Excluded: {skipped}")
+        print(f"{'='*80}")
+        if not writer.count:
+            print("\n⚠️ Warning: No valid assessments collected!")
+            return
+        print(f"\n💾 Saved to: {args.output}")
+        # Statistics
+        print(f"\n{'='*80}")
+        print("Dataset Statistics:")
+        print(f"{'='*80}")
+        # Count by test type
+        print("\nTest Type Distribution:")
+        for test_type, count in sorted(type_counts.items(), key=lambda x: -x[1]):
+            print(f" {test_type}: {count}")
+        # Duration stats
+        print(f"\nAssessments with duration info: {with_duration}/{writer.count}")
+        # Show sample (should now match train.csv, e.g., Java assessments under /solutions/)
+        print(f"\n{'='*80}")
+        print("Sample assessments:")
+        print(f"{'='*80}")
+        for i, a in enumerate(samples, 1):
+            print(f"\n{i}. {a.name}")
+            print(f" URL: {a.url}")
+            print(f" Types: {', '.join(a.test_type)}")
+            print(f" Duration: {a.duration or 'N/A'}")
+            print(f" Description: {a.description[:100]}...")
+        print("\n✅ Done! Run with --max 0 for full scrape.")
+    finally:
+        SESSION.close()
 if __name__ == '__main__':
     main()
\ No newline at end of file
@@ -5,6 +5,11 @@ Test script to verify API functionality.
 import requests
 import json
 import sys
+from concurrent.futures import Future, ThreadPoolExecutor
+from typing import Optional
+
+# One keep-alive session for every request in the run
+SESSION = requests.Session()
 
 
 def test_health(base_url: str):
@@ -14,7 +19,7 @@ def test_health(base_url: str):
     print("="*80)
     
     try:
-        response = requests.get(f"{base_url}/health", timeout=5)
+        response = SESSION.get(f"{base_url}/health", timeout=5)
         print(f"Status Code: {response.status_code}")
         print(f"Response: {response.json()}")
         
@@ -29,20 +34,25 @@ def test_health(base_url: str):
         return False
 
 
-def test_recommend(base_url: str, query: str):
-    """Test recommend endpoint."""
+def post_recommend(base_url: str, query: str) -> requests.Response:
+    """POST a query to the recommend endpoint."""
+    return SESSION.post(
+        f"{base_url}/recommend",
+        json={"query": query},
+        headers={"Content-Type": "application/json"},
+        timeout=30
+    )
+
+
+def test_recommend(base_url: str, query: str, pending: Optional[Future] = None):
+    """Test recommend endpoint (pending: an already-submitted post_recommend call)."""
     print("\n" + "="*80)
     print(f"Testing Recommend Endpoint")
     print(f"Query: {query[:100]}...")
     print("="*80)
     
     try:
-        response = requests.post(
-            f"{base_url}/recommend",
-            json={"query": query},
-            headers={"Content-Type": "application/json"},
-            timeout=30
-        )
+        response = pending.result() if pending else post_recommend(base_url, query)
         
         print(f"Status Code: {response.status_code}")
         
@@ -99,7 +109,7 @@ def test_error_handling(base_url: str):
     # Test empty query
     print("\nTest 1: Empty query")
     try:
-        response = requests.post(
+        response = SESSION.post(
             f"{base_url}/recommend",
             json={"query": ""},
             timeout=5
@@ -114,7 +124,7 @@ def test_error_handling(base_url: str):
     # Test missing query
     print("\nTest 2: Missing query field")
     try:
-        response = requests.post(
+        response = SESSION.post(
             f"{base_url}/recommend",
             json={},
             timeout=5
@@ -129,7 +139,7 @@ def test_error_handling(base_url: str):
     # Test invalid JSON
     print("\nTest 3: Invalid JSON")
     try:
-        response = requests.post(
+        response = SESSION.post(
             f"{base_url}/recommend",
             data="invalid json",
             headers={"Content-Type": "application/json"},
@@ -167,10 +177,11 @@ def main():
         "Senior data analyst with SQL and Python expertise"
     ]
     
-    results = []
-    for query in test_queries:
-        result = test_recommend(base_url, query)
-        results.append(result)
+    # Queries are independent: send them concurrently, then report in order
+    with ThreadPoolExecutor(max_workers=len(test_queries)) as executor:
+        pending = [executor.submit(post_recommend, base_url, query) for query in test_queries]
+        results = [test_recommend(base_url, query, future)
+                   for query, future in zip(test_queries, pending)]
     
     # Test error handling
     test_error_handling(base_url)
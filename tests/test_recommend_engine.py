@@ -0,0 +1,174 @@
+"""Engine checks on a small synthetic catalog (run `python -m pytest` from the repo root)."""
+import json
+import re
+
+import numpy as np
+import pandas as pd
+import pytest
+from sklearn.feature_extraction.text import TfidfVectorizer
+
+from final_recommend_eng import SHLRecommendationEngine
+
+VIEW_URL = "https://www.shl.com/solutions/products/product-catalog/view/"
+QUERY = "hiring python engineers for data pipelines"
+
+
+class SmallPoolEngine(SHLRecommendationEngine):
+    # Use the ANN index despite the tiny catalog, with few candidates so rows
+    # outside the neighbour set are easy to miss
+    ANN_MIN_DOCS = 0
+    CANDIDATE_POOL = 3
+
+
+def _assessment(name, url, description, duration=30):
+    return {
+        'name': name, 'url': url, 'description': description, 'duration': duration,
+        'adaptive_support': False, 'remote_support': True, 'test_type': ['K']
+    }
+
+
+def _build_engine(tmp_path):
+    catalog = [
+        _assessment(f"Python Skills {i}", f"{VIEW_URL}python-skills-{i}/",
+                    f"Python python engineers data pipelines test number {i}")
+        for i in range(20)
+    ]
+    # Two catalog rows that normalize to the same URL (old /products/ path and /solutions/ path)
+    catalog.append(_assessment("Pipeline Design", "https://www.shl.com/products/product-catalog/view/pipeline-design/",
+                               "Architecture review of batch systems for python teams"))
+    catalog.append(_assessment("Pipeline Design", f"{VIEW_URL}pipeline-design/",
+                               "Architecture review of batch systems for python teams"))
+    data_file = tmp_path / "catalog.json"
+    data_file.write_text(json.dumps(catalog), encoding='utf-8')
+    train_file = tmp_path / "train.csv"
+    pd.DataFrame({'Query': [QUERY], 'Assessment_url': [f"{VIEW_URL}pipeline-design"]}).to_csv(train_file, index=False)
+    return SmallPoolEngine(str(data_file), str(train_file), cache_dir=str(tmp_path / "cache"))
+
+
+def test_trained_indices_cover_duplicate_urls(tmp_path):
+    engine = _build_engine(tmp_path)
+    boosted_rows = np.unique(np.concatenate(list(engine._train_query_url_indices.values())))
+    assert set(boosted_rows) == {20, 21}
+    np.testing.assert_array_equal(engine.trained_indices, boosted_rows)
+
+
+def test_cached_index_maps_saved_matrix(tmp_path):
+    stale_dir = tmp_path / "cache" / "doc_matrix_0123456789abcdef"
+    stale_dir.mkdir(parents=True)
+    built = _build_engine(tmp_path)
+    assert not stale_dir.exists()
+    matrix_dirs = list((tmp_path / "cache").glob("doc_matrix_*"))
+    assert [d.name for d in matrix_dirs] == [f"doc_matrix_{built._index_key}"]
+
+    loaded = _build_engine(tmp_path)
+    # Read-only arrays: mapped from the .npy files, not unpickled into RAM
+    assert not loaded.tfidf_matrix.data.flags.writeable
+    assert (loaded.tfidf_matrix != built.tfidf_matrix).nnz == 0
+    assert loaded.get_recommendations(QUERY, top_k=5) == built.get_recommendations(QUERY, top_k=5)
+
+
+def test_single_and_batch_agree_on_duplicate_urls(tmp_path):
+    engine = _build_engine(tmp_path)
+    single = engine.get_recommendations(QUERY, top_k=5)
+    batch = engine.get_recommendations_batch([QUERY], top_k=5)[0]
+    assert [r['url'] for r in single] == [r['url'] for r in batch]
+    assert {r['url'] for r in single[:2]} == {engine._urls[20], engine._urls[21]}
+
+
+@pytest.mark.parametrize("engine_cls", [SHLRecommendationEngine, SmallPoolEngine])
+def test_single_and_batch_agree_under_duration_filter(tmp_path, engine_cls):
+    # Mostly long assessments, so a 20 minute limit filters out most neighbours
+    # and the results are padded
+    catalog = [
+        _assessment(f"Python Skills {i}", f"{VIEW_URL}python-skills-{i}/",
+                    f"Python engineers coding test {'data ' * (i % 5)}pipelines",
+                    duration=15 if i % 4 == 0 else 60)
+        for i in range(20)
+    ]
+    catalog += [
+        _assessment(f"Sales Review {i}", f"{VIEW_URL}sales-review-{i}/",
+                    "Sales team review for graduates", duration=20)
+        for i in range(8)
+    ]
+    data_file = tmp_path / "catalog.json"
+    data_file.write_text(json.dumps(catalog), encoding='utf-8')
+    train_file = tmp_path / "train.csv"
+    pd.DataFrame({'Query': [QUERY], 'Assessment_url': [f"{VIEW_URL}sales-review-0"]}).to_csv(train_file, index=False)
+    engine = engine_cls(str(data_file), str(train_file), cache_dir=str(tmp_path / "cache"))
+
+    queries = ["python engineers in 20 minutes", "data pipelines test within 20 mins",
+               "graduates for sales, 20 minutes", QUERY]
+    batch = engine.get_recommendations_batch(queries, top_k=10)
+    for query, batch_recs in zip(queries, batch):
+        single = engine.get_recommendations(query, top_k=10)
+        assert [r['url'] for r in single] == [r['url'] for r in batch_recs]
+        assert [r['score'] for r in single] == pytest.approx([r['score'] for r in batch_recs])
+
+
+def _repeated_text(row):
+    """Enriched text with every block written out, as the engine built it before weighting by repeats."""
+    name_lower = row['name'].lower()
+    parts = [row['name']] * 10
+    parts += re.findall(r'\b(java|python|sql|javascript|selenium|html|css|c\+\+|excel|tableau|aws|azure|react|angular|node)\b',
+                        name_lower) * 20
+    if re.search('leadership|executive|coo|manager|opq', name_lower):
+        parts += ['leadership executive senior management strategy'] * 10
+    if re.search('bank|financial|admin|clerk', name_lower):
+        parts += ['banking financial administrative clerical'] * 8
+    parts += row['test_type'] * 15
+    keywords = {'K': ('technical knowledge skills programming coding development', 5),
+                'A': ('ability aptitude skills', 3)}
+    for code in row['test_type']:
+        if code in keywords:
+            parts += [keywords[code][0]] * keywords[code][1]
+    parts += [row['description']] * 3
+    parts.append(f"duration {float(row['duration'])} minutes")
+    if row['duration'] <= 30:
+        parts += ['quick short'] * 2
+    elif row['duration'] <= 45:
+        parts += ['standard medium'] * 2
+    return ' '.join(parts)
+
+
+def test_enrichment_matches_repeated_text(tmp_path):
+    _build_engine(tmp_path)
+    catalog = json.loads((tmp_path / "catalog.json").read_text(encoding='utf-8'))
+    catalog[0].update(name="Java Manager Review", test_type=['K', 'A'])
+    catalog[1].update(name="Bank Clerk", duration=40)
+    catalog[2].update(duration=60)
+    (tmp_path / "catalog.json").write_text(json.dumps(catalog), encoding='utf-8')
+    engine = SHLRecommendationEngine(str(tmp_path / "catalog.json"), str(tmp_path / "train.csv"),
+                                     cache_dir=str(tmp_path / "cache2"))
+    expected = TfidfVectorizer(
+        max_features=15000, ngram_range=(1, 3), max_df=0.85, sublinear_tf=True,
+        token_pattern=r'\b[a-zA-Z][a-zA-Z+#\.]*\b', dtype=np.float32
+    )
+    expected_matrix = expected.fit_transform([_repeated_text(row) for row in catalog])
+    assert engine.vectorizer.vocabulary_ == expected.vocabulary_
+    np.testing.assert_allclose(engine.tfidf_matrix.toarray(), expected_matrix.toarray(), atol=1e-6)
+
+
+# Top 5 for Test_file.csv queries, as ranked by the repeated-text engine
+SHIPPED_RANKINGS = {
+    "Looking to hire mid-level professionals who are proficient in Python, SQL and Java Script. "
+    "Need an assessment package that can test all skills with max duration of 60 minutes.":
+        ['python-new', 'sql-server-new', 'javascript-new', 'verify-deductive-reasoning', 'sql-new'],
+    "I am hiring for an analyst and wants applications to screen using Cognitive and personality tests, "
+    "what options are available within 45 mins.":
+        ['opq-universal-competency-report-2-0', 'opq-universal-competency-report', 'opq-leadership-report',
+         'filing-numbers', 'shl-verify-interactive-deductive-reasoning'],
+    "I am new looking for new graduates in my sales team, suggest an 30 min long assessment":
+        ['opq-mq-sales-report', 'sales-transformation-report-2-0-sales-manager',
+         'sales-transformation-report-sales-manager', 'marketing-new',
+         'sales-transformation-report-individual-contributor'],
+    "I want to hire a product manager with 3-4 years of work experience and expertise in SDLC, Jira and Confluence":
+        ['microsoft-excel-365-new', 'microsoft-excel-365-essentials-new', 'sql-server-new', 'python-new',
+         'automata-sql-new'],
+}
+
+
+def test_shipped_catalog_ranking(tmp_path):
+    engine = SHLRecommendationEngine(cache_dir=str(tmp_path / "cache"))
+    for query, expected in SHIPPED_RANKINGS.items():
+        urls = [rec['url'] for rec in engine.get_recommendations(query, top_k=10)]
+        assert [url.rstrip('/').rsplit('/', 1)[-1] for url in urls[:5]] == expected, query
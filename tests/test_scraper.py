@@ -0,0 +1,68 @@
+"""Scraper checks against a local HTTP server serving synthetic pages (never the live site)."""
+import asyncio
+import subprocess
+import sys
+import threading
+from functools import partial
+from http.server import SimpleHTTPRequestHandler, ThreadingHTTPServer
+from pathlib import Path
+
+import pytest
+
+import scraper
+
+REPO_ROOT = Path(__file__).resolve().parent.parent
+
+PAGE = """<html><head><title>{name} | SHL</title>
+<meta name="description" content="{name} measures {skill} for graduate and professional hiring.">
+</head><body><h1>{name}</h1>
+<div class="product-description"><p>The {name} assessment measures {skill} knowledge and
+problem solving for candidates at every level. Approximate completion time {minutes} minutes.
+Remote testing is supported and the test is adaptive.</p></div>
+<ul><li>{skill}</li><li>reasoning</li></ul></body></html>"""
+
+
+class QuietHandler(SimpleHTTPRequestHandler):
+    def log_message(self, *args):
+        pass
+
+
+@pytest.fixture
+def site(tmp_path, monkeypatch):
+    """Serve synthetic assessment pages on 127.0.0.1; yields the page URLs."""
+    root = tmp_path / "site"
+    urls = []
+    for i, (skill, minutes) in enumerate([("Python", 20), ("Java", 35), ("Personality", 25), ("SQL", 15)]):
+        page_dir = root / "view" / f"{skill.lower()}-{i}"
+        page_dir.mkdir(parents=True)
+        (page_dir / "index.html").write_text(PAGE.format(name=f"{skill} Test", skill=skill, minutes=minutes))
+        urls.append(f"view/{skill.lower()}-{i}/")
+    (root / "view" / "brochure.pdf").write_bytes(b"%PDF-1.4 not a page")
+    urls += ["view/missing/", "view/brochure.pdf"]
+
+    server = ThreadingHTTPServer(('127.0.0.1', 0), partial(QuietHandler, directory=str(root)))
+    threading.Thread(target=server.serve_forever, daemon=True).start()
+    monkeypatch.setattr(scraper, 'RATE_LIMITER', scraper.RateLimiter(0))
+    monkeypatch.setattr(scraper, 'USE_PAGE_CACHE', False)
+    monkeypatch.setattr(scraper, 'PAGE_CACHE_DIR', str(tmp_path / "page_cache"))
+    yield [f"http://127.0.0.1:{server.server_address[1]}/{url}" for url in urls]
+    server.shutdown()
+    server.server_close()
+
+
+def test_async_matches_threaded(site):
+    pytest.importorskip("aiohttp")
+
+    async def collect():
+        return [a async for a in scraper.iter_assessments_async(site, concurrency=3)]
+
+    threaded = list(scraper.iter_assessments_threaded(site, concurrency=3))
+    assert [a.name if a else None for a in threaded] == \
+        ["Python Test", "Java Test", "Personality Test", "SQL Test", None, None]
+    assert asyncio.run(collect()) == threaded
+
+
+def test_scraper_imports_without_aiohttp():
+    # A None entry in sys.modules makes `import aiohttp` raise ImportError
+    code = "import sys; sys.modules['aiohttp'] = None; import scraper; assert scraper.aiohttp is None"
+    subprocess.run([sys.executable, "-c", code], cwd=REPO_ROOT, check=True)
@@ -0,0 +1,19 @@
+#!/usr/bin/env python3
+"""
+WSGI entry point for production serving.
+
+The engine is built here, at import time, so with --preload gunicorn loads
+it once in the master and forked workers share its pages:
+    gunicorn --preload -w $(nproc) -k gthread --threads 4 -b 0.0.0.0:$PORT wsgi:application
+"""
+import os
+
+# Pin BLAS pools before numpy loads; workers x threads already fill the cores
+for var in ('OPENBLAS_NUM_THREADS', 'MKL_NUM_THREADS', 'OMP_NUM_THREADS'):
+    os.environ.setdefault(var, '1')
+
+from api import app, get_engine
+
+get_engine()
+
+application = app